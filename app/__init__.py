@@ -1,14 +1,23 @@
 import logging
 import os
 from dataclasses import dataclass
+from datetime import datetime, time
 from typing import Literal
 
 from telegram.ext import Application, Defaults
 
-from app.cache import (card_data_cache_job, feedbacks_cache_job,
-                       games_cache_job, roles_cache_job, users_cache_job)
+from app.api import (card_store_job, close_http_client, close_image_executor,
+                     load_card_names, load_card_store)
+from app.cache import (flush_post_quota, flush_user_info, load_card_file_ids,
+                       load_role_index, post_quota_job, post_quota_reset_job,
+                       user_info_job)
+from app.constants import CardStoreLimits, UpdateProcessing, WriteBehind
+from app.database import close_async_pool, close_pool, open_async_pool
+from app.game_engine import resume_games, suspend_games
 from app.handlers.admin_commands.market_plus import market_plus_job
 from app.logger import post_logs_job
+from app.update_processor import (ChatOrderedUpdateProcessor,
+                                  get_max_concurrent_updates)
 
 
 @dataclass
@@ -24,6 +33,15 @@ class Bot:
             Application.builder()
             .token(parameters.token)
             .defaults(parameters.defaults)
+            .concurrent_updates(
+                ChatOrderedUpdateProcessor(
+                    max_concurrent_updates=get_max_concurrent_updates(),
+                    max_pending_updates=UpdateProcessing.MAX_PENDING_UPDATES,
+                )
+            )
+            .post_init(self.post_init)
+            .post_stop(self.post_stop)
+            .post_shutdown(self.post_shutdown)
             .build()
         )
         self.add_handlers(parameters.handlers)
@@ -34,15 +52,50 @@ class Bot:
 
     def add_jobs(self) -> None:
         self.job_queue = self.application.job_queue
-        self.job_queue.run_repeating(users_cache_job, interval=1800, first=120)
-        self.job_queue.run_repeating(roles_cache_job, interval=1800, first=240)
-        self.job_queue.run_repeating(feedbacks_cache_job, interval=1800, first=360)
-        self.job_queue.run_repeating(games_cache_job, interval=1800, first=480)
-        self.job_queue.run_repeating(card_data_cache_job, interval=1800, first=600)
+        self.job_queue.run_repeating(
+            user_info_job,
+            interval=WriteBehind.USER_INFO_FLUSH_INTERVAL,
+            first=WriteBehind.USER_INFO_FLUSH_INTERVAL,
+        )
+        self.job_queue.run_repeating(
+            post_quota_job,
+            interval=WriteBehind.POST_QUOTA_FLUSH_INTERVAL,
+            first=WriteBehind.POST_QUOTA_FLUSH_INTERVAL,
+        )
+        self.job_queue.run_daily(
+            post_quota_reset_job,
+            time=time(hour=0, minute=0, tzinfo=datetime.now().astimezone().tzinfo),
+        )
+
+        self.job_queue.run_repeating(
+            card_store_job,
+            interval=CardStoreLimits.REFRESH_INTERVAL,
+            first=CardStoreLimits.REFRESH_INTERVAL,
+        )
 
         self.job_queue.run_repeating(post_logs_job, interval=60, first=60)
         self.job_queue.run_repeating(market_plus_job, interval=1800, first=1800)
 
+    async def post_init(self, application: Application) -> None:
+        await open_async_pool()
+        await load_role_index()
+        await load_card_file_ids()
+        if not await load_card_store():
+            self.job_queue.run_once(card_store_job, when=1)
+        await load_card_names()
+        await resume_games(application)
+
+    async def post_stop(self, application: Application) -> None:
+        await suspend_games()
+
+    async def post_shutdown(self, application: Application) -> None:
+        await flush_user_info()
+        await flush_post_quota()
+        await close_http_client()
+        close_image_executor()
+        await close_async_pool()
+        close_pool()
+
     def run(
         self,
         mode: Literal["polling", "webhook"],
@@ -1,3 +1,14 @@
 # trunk-ignore-all(ruff)
 
-from .card_search import CardData, fetch_card_data, get_cropped_image, get_image_bytes
+from .card_search import (CardData, fetch_card_data, get_cropped_image,
+                          get_image_bytes, render_card_frames,
+                          render_crop_levels)
+from .card_names import (get_random_card_name, is_card_names_loaded,
+                         load_card_names, search_card_names)
+from .card_store import (CardInfo, card_store_job, find_card, get_card_info,
+                         get_card_info_by_id, load_card_store,
+                         normalize_card_name, refresh_card_store,
+                         suggest_cards)
+from .fuzzy_index import FuzzyIndex
+from .http_client import close_http_client, http_get
+from .image_worker import close_image_executor, run_image_task
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass
+
+import httpx
+
+from .card_store import normalize_card_name, write_card_dump
+from .fuzzy_index import FuzzyIndex
+from .http_client import http_get
+
+CARD_NAMES_URL = "https://db.ygorganization.com/data/idx/card/name/en"
+CARD_NAMES_PATH = "app/static/card_names.json"
+
+
+@dataclass
+class CardNames:
+    names: dict[str, str]
+    keys: tuple[str, ...]
+    choices: tuple[str, ...]
+    index: FuzzyIndex
+    mtime: float | None = None
+
+
+card_names = CardNames(names={}, keys=(), choices=(), index=FuzzyIndex())
+
+
+def build_card_names(raw_names: list[str], mtime: float | None = None) -> CardNames:
+    names = {
+        sys.intern(normalize_card_name(name)): sys.intern(name) for name in raw_names
+    }
+    keys = tuple(sorted(names.keys()))
+    return CardNames(
+        names=names,
+        keys=keys,
+        choices=tuple(names.values()),
+        index=FuzzyIndex(keys),
+        mtime=mtime,
+    )
+
+
+def read_card_names(path: str) -> CardNames:
+    mtime = os.stat(os.path.abspath(path)).st_mtime
+    with open(os.path.abspath(path), "rb") as f:
+        return build_card_names(parse_card_names(f.read()), mtime)
+
+
+def set_card_names(new_card_names: CardNames) -> None:
+    card_names.names = new_card_names.names
+    card_names.keys = new_card_names.keys
+    card_names.choices = new_card_names.choices
+    card_names.index = new_card_names.index
+    card_names.mtime = new_card_names.mtime
+
+
+def is_card_names_loaded() -> bool:
+    return len(card_names.names) > 0
+
+
+def parse_card_names(raw_names: bytes) -> list[str]:
+    names = json.loads(raw_names)
+    if not isinstance(names, dict) or len(names) == 0:
+        raise ValueError("expected a non empty object of card names")
+    return list(names.keys())
+
+
+async def download_card_names(path: str = CARD_NAMES_PATH) -> bool:
+    response = await http_get(CARD_NAMES_URL)
+    if response is None or response.is_error:
+        return False
+    try:
+        await asyncio.to_thread(parse_card_names, response.content)
+        # Written next to the live file and swapped in, never half written
+        await asyncio.to_thread(write_card_dump, path, response.content)
+    except (OSError, ValueError, httpx.HTTPError) as err:
+        logging.log(logging.ERROR, f"Could not download the card names: {err!r}")
+        return False
+    return True
+
+
+async def load_card_names(path: str = CARD_NAMES_PATH) -> bool:
+    if not os.path.exists(os.path.abspath(path)):
+        if not await download_card_names(path):
+            return False
+    try:
+        # The file is parsed again only when it changed since the last load
+        if os.stat(os.path.abspath(path)).st_mtime == card_names.mtime:
+            return True
+        set_card_names(await asyncio.to_thread(read_card_names, path))
+    except (OSError, ValueError) as err:
+        logging.log(logging.ERROR, f"Could not load the card names: {err!r}")
+        return False
+    return True
+
+
+def get_random_card_name(excluded_names: set[str] | None = None) -> str | None:
+    choices = card_names.choices
+    if excluded_names is None:
+        excluded_names = set()
+    if len(choices) <= len(excluded_names):
+        return None
+    while True:
+        # trunk-ignore(bandit/B311)
+        name = choices[random.randrange(len(choices))]
+        if name not in excluded_names:
+            return name
+
+
+def search_card_names(search_word: str, k: int = 10) -> list[str]:
+    search_word = normalize_card_name(search_word)
+    keys = card_names.keys
+
+    # Names starting with the typed text come first, then the closest ones
+    results: list[str] = []
+    start = bisect_left(keys, search_word)
+    for key in keys[start : start + k]:
+        if not key.startswith(search_word):
+            break
+        results.append(key)
+    if len(results) < k:
+        for key, _ in card_names.index.search(search_word, k):
+            if key not in results:
+                results.append(key)
+            if len(results) == k:
+                break
+    return [card_names.names[key] for key in results]
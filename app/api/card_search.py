@@ -1,31 +1,46 @@
-import asyncio
-import json
 import logging
 import random
 from dataclasses import dataclass
 from io import BytesIO
 from typing import Literal
 
-import requests
 from PIL import Image, UnidentifiedImageError
 
+from app.constants import CardImage
+
+from .card_store import CardInfo, find_card, is_card_store_loaded
+from .http_client import http_get
+from .image_worker import run_image_task
+
 type CropLevel = Literal[0, 1, 2, 3, 4]
 
 @dataclass
 class CardData:
     name: str
     desc: str
-    image: Image
+    image_bytes: bytes
+
+    @property
+    def image(self) -> Image:
+        return Image.open(BytesIO(self.image_bytes))
 
 
 async def fetch_card_data(search_word: str) -> CardData | None:
+    if is_card_store_loaded():
+        card_info = find_card(search_word)
+        if card_info is None:
+            return None
+        return await download_card_data(card_info)
+
     ENDPOINT_URL = "https://db.ygoprodeck.com/api/v7/cardinfo.php"
-    full_url = ENDPOINT_URL + "?fname=" + search_word
-    result = await asyncio.to_thread(requests.get, url=full_url, timeout=10)
-    if result is None or result.content is None:
+    result = await http_get(ENDPOINT_URL, params={"fname": search_word})
+    if result is None:
         return None
     
-    response = dict(json.loads(result.content))
+    try:
+        response = dict(result.json())
+    except ValueError:
+        return None
     if response.get("error"):
         return None
     
@@ -35,9 +50,10 @@ async def fetch_card_data(search_word: str) -> CardData | None:
         return None
     data: dict = data[0]
 
+    card_id = data.get("id")
     card_name = data.get("name")
     card_description = data.get("desc")
-    if card_name is None or card_description is None:
+    if card_id is None or card_name is None or card_description is None:
         return None
     
     card_image_urls = data.get("card_images")
@@ -49,19 +65,38 @@ async def fetch_card_data(search_word: str) -> CardData | None:
     if cropped_image_url is None:
         return None
     
-    image_result = await asyncio.to_thread(requests.get, url=cropped_image_url, stream=True, timeout=10)
-    if image_result is None:
+    return await download_card_data(
+        CardInfo(
+            id=card_id,
+            name=card_name,
+            desc=card_description,
+            image_url=cropped_image_url,
+        )
+    )
+
+
+async def download_card_data(card_info: CardInfo) -> CardData | None:
+    image_result = await http_get(card_info.image_url)
+    if image_result is None or image_result.is_error:
         return None
     
     try:
-        image = Image.open(image_result.raw)
+        image_bytes = await run_image_task(compress_image_bytes, image_result.content)
     except UnidentifiedImageError:
         return None
     except Exception as err:
         logging.log(logging.ERROR, err)
         return None
     
-    return CardData(name=card_name, desc=card_description, image=image)
+    return CardData(name=card_info.name, desc=card_info.desc, image_bytes=image_bytes)
+
+
+def compress_image_bytes(image_bytes: bytes) -> bytes:
+    image = Image.open(BytesIO(image_bytes))
+    # Keep the downloaded file as is when it is already compressed
+    if image.format in CardImage.KEPT_FORMATS:
+        return image_bytes
+    return get_image_bytes(image)
 
 
 def get_cropped_image(image: Image, crop_level: CropLevel = 0) -> Image:
@@ -81,6 +116,21 @@ def get_cropped_image(image: Image, crop_level: CropLevel = 0) -> Image:
 
 
 def get_image_bytes(image: Image) -> bytes:
+    if image.mode != "RGB":
+        image = image.convert("RGB")
     byte_array = BytesIO()
-    image.save(byte_array, format='BMP')
-    return byte_array.getvalue()
\ No newline at end of file
+    image.save(byte_array, format=CardImage.FORMAT, quality=CardImage.QUALITY)
+    return byte_array.getvalue()
+
+
+def render_crop_levels(image_bytes: bytes) -> tuple[bytes, ...]:
+    image = Image.open(BytesIO(image_bytes))
+    image.load()
+    return tuple(
+        get_image_bytes(get_cropped_image(image, crop_level).resize(image.size))
+        for crop_level in range(5)
+    )
+
+
+async def render_card_frames(image_bytes: bytes) -> tuple[bytes, ...]:
+    return await run_image_task(render_crop_levels, image_bytes)
\ No newline at end of file
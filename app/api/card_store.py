@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass
+
+from telegram.ext import ContextTypes
+
+from app.constants import CardStoreLimits
+
+from .fuzzy_index import FuzzyIndex
+from .http_client import http_get
+
+CARD_DUMP_URL = "https://db.ygoprodeck.com/api/v7/cardinfo.php"
+CARD_DUMP_PATH = "app/static/cardinfo.json"
+
+
+@dataclass(frozen=True, slots=True)
+class CardInfo:
+    id: int
+    name: str
+    desc: str
+    image_url: str
+
+
+@dataclass
+class CardStore:
+    cards: dict[str, CardInfo]
+    names: tuple[str, ...]
+    ids: dict[int, str]
+    index: FuzzyIndex
+
+
+card_store = CardStore(cards={}, names=(), ids={}, index=FuzzyIndex())
+
+
+def normalize_card_name(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def parse_card_dump(raw_dump: bytes) -> dict[str, CardInfo]:
+    cards: dict[str, CardInfo] = {}
+    for data in dict(json.loads(raw_dump)).get("data", []):
+        card_id: int | None = data.get("id")
+        name: str | None = data.get("name")
+        desc: str | None = data.get("desc")
+        card_images: list[dict] | None = data.get("card_images")
+        if card_id is None or name is None or desc is None or not card_images:
+            continue
+        image_url: str | None = card_images[0].get("image_url_cropped")
+        if image_url is None:
+            continue
+        cards[sys.intern(normalize_card_name(name))] = CardInfo(
+            id=card_id, name=name, desc=desc, image_url=image_url
+        )
+    return cards
+
+
+def build_card_store(cards: dict[str, CardInfo]) -> CardStore:
+    names = tuple(sorted(cards.keys()))
+    ids = {card_info.id: name for name, card_info in cards.items()}
+    return CardStore(cards=cards, names=names, ids=ids, index=FuzzyIndex(names))
+
+
+def set_card_store(store: CardStore) -> None:
+    card_store.cards = store.cards
+    card_store.names = store.names
+    card_store.ids = store.ids
+    card_store.index = store.index
+
+
+def set_cards(cards: dict[str, CardInfo]) -> None:
+    set_card_store(build_card_store(cards))
+
+
+def is_card_store_loaded() -> bool:
+    return len(card_store.cards) > 0
+
+
+def find_card(search_word: str) -> CardInfo | None:
+    search_word = normalize_card_name(search_word)
+    if card_info := card_store.cards.get(search_word):
+        return card_info
+
+    # Same semantics as the fname API parameter, ambiguous words find nothing
+    matches = card_store.index.find_containing(search_word, limit=2)
+    return card_store.cards[matches[0]] if len(matches) == 1 else None
+
+
+def get_card_info(card_name: str) -> CardInfo | None:
+    return card_store.cards.get(normalize_card_name(card_name))
+
+
+def get_card_info_by_id(card_id: int) -> CardInfo | None:
+    name = card_store.ids.get(card_id)
+    return card_store.cards[name] if name is not None else None
+
+
+def suggest_cards(search_word: str, k: int = 5) -> list[tuple[CardInfo, float]]:
+    return [
+        (card_store.cards[name], score)
+        for name, score in card_store.index.search(normalize_card_name(search_word), k)
+    ]
+
+
+def read_card_dump(path: str) -> CardStore:
+    with open(os.path.abspath(path), "rb") as f:
+        return build_card_store(parse_card_dump(f.read()))
+
+
+def write_card_dump(path: str, raw_dump: bytes) -> None:
+    tmp_path = os.path.abspath(path) + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(raw_dump)
+    os.replace(tmp_path, os.path.abspath(path))
+
+
+async def load_card_store(path: str = CARD_DUMP_PATH) -> bool:
+    if not os.path.exists(os.path.abspath(path)):
+        return False
+    try:
+        store = await asyncio.to_thread(read_card_dump, path)
+    except (OSError, ValueError) as err:
+        logging.log(logging.ERROR, f"Could not load the card dump: {err!r}")
+        return False
+    set_card_store(store)
+    return True
+
+
+async def refresh_card_store(path: str = CARD_DUMP_PATH) -> bool:
+    response = await http_get(CARD_DUMP_URL, timeout=CardStoreLimits.DUMP_TIMEOUT)
+    if response is None or response.is_error:
+        return False
+    try:
+        cards = await asyncio.to_thread(parse_card_dump, response.content)
+    except ValueError as err:
+        logging.log(logging.ERROR, f"Invalid card dump: {err!r}")
+        return False
+    if len(cards) < CardStoreLimits.MIN_DUMP_SIZE:
+        logging.log(logging.ERROR, f"Card dump too small: {len(cards)} cards")
+        return False
+    await asyncio.to_thread(write_card_dump, path, response.content)
+    set_card_store(await asyncio.to_thread(build_card_store, cards))
+    return True
+
+
+async def card_store_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    await refresh_card_store()
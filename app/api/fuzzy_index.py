@@ -0,0 +1,65 @@
+import heapq
+from collections import Counter
+
+
+def get_trigrams(word: str) -> set[str]:
+    word = f"  {word} "
+    return {word[i : i + 3] for i in range(len(word) - 2)}
+
+
+class FuzzyIndex:
+    def __init__(self, names: tuple[str, ...] = ()) -> None:
+        self.names = names
+        self.sizes: list[int] = []
+        self.postings: dict[str, list[int]] = {}
+        for name_id, name in enumerate(names):
+            trigrams = get_trigrams(name)
+            self.sizes.append(len(trigrams))
+            for trigram in trigrams:
+                self.postings.setdefault(trigram, []).append(name_id)
+
+    def search(self, word: str, k: int = 5) -> list[tuple[str, float]]:
+        trigrams = get_trigrams(word)
+        shared: Counter[int] = Counter()
+        for trigram in trigrams:
+            if name_ids := self.postings.get(trigram):
+                shared.update(name_ids)
+        if len(shared) == 0:
+            return []
+
+        # Dice coefficient over the trigram sets
+        word_size = len(trigrams)
+        best = heapq.nlargest(
+            k,
+            shared.items(),
+            key=lambda item: item[1] / (word_size + self.sizes[item[0]]),
+        )
+        return [
+            (self.names[name_id], 2 * count / (word_size + self.sizes[name_id]))
+            for name_id, count in best
+        ]
+
+    def find_containing(self, word: str, limit: int | None = None) -> list[str]:
+        # Every trigram inside the word is also a trigram of the names holding it
+        trigrams = {word[i : i + 3] for i in range(len(word) - 2)}
+        candidates: range | list[int]
+        if len(trigrams) == 0:
+            candidates = range(len(self.names))
+        else:
+            postings = sorted(
+                (self.postings.get(trigram, []) for trigram in trigrams), key=len
+            )
+            shared = set(postings[0])
+            for name_ids in postings[1:]:
+                if len(shared) == 0:
+                    break
+                shared.intersection_update(name_ids)
+            candidates = sorted(shared)
+
+        names: list[str] = []
+        for name_id in candidates:
+            if word in self.names[name_id]:
+                names.append(self.names[name_id])
+                if len(names) == limit:
+                    break
+        return names
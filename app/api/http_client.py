@@ -0,0 +1,45 @@
+import asyncio
+import logging
+
+import httpx
+
+from app.constants import HttpLimits
+
+HTTP_CLIENT: httpx.AsyncClient | None = None
+HTTP_SEMAPHORE: asyncio.Semaphore | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global HTTP_CLIENT, HTTP_SEMAPHORE
+    if HTTP_CLIENT is None or HTTP_CLIENT.is_closed:
+        HTTP_CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                HttpLimits.TIMEOUT, connect=HttpLimits.CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=HttpLimits.MAX_CONNECTIONS,
+                max_keepalive_connections=HttpLimits.MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            follow_redirects=True,
+        )
+        HTTP_SEMAPHORE = asyncio.Semaphore(HttpLimits.MAX_CONNECTIONS)
+    return HTTP_CLIENT
+
+
+async def http_get(
+    url: str, params: dict | None = None, timeout: float = HttpLimits.TIMEOUT
+) -> httpx.Response | None:
+    client = get_http_client()
+    async with HTTP_SEMAPHORE:
+        try:
+            return await client.get(url, params=params, timeout=timeout)
+        except httpx.HTTPError as err:
+            logging.log(logging.ERROR, f"GET {url} failed: {err!r}")
+            return None
+
+
+async def close_http_client() -> None:
+    global HTTP_CLIENT
+    if HTTP_CLIENT is not None:
+        await HTTP_CLIENT.aclose()
+        HTTP_CLIENT = None
@@ -0,0 +1,36 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from app.constants import ImageWorker
+
+IMAGE_EXECUTOR: ProcessPoolExecutor | None = None
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    global IMAGE_EXECUTOR
+    if IMAGE_EXECUTOR is None:
+        IMAGE_EXECUTOR = ProcessPoolExecutor(
+            max_workers=ImageWorker.MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return IMAGE_EXECUTOR
+
+
+async def run_image_task[*Ts, R](func: Callable[[*Ts], R], *args: *Ts) -> R:
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_image_executor(), func, *args)
+    except BrokenProcessPool:
+        # A crashed worker breaks the whole pool, start a fresh one
+        close_image_executor()
+        return await loop.run_in_executor(get_image_executor(), func, *args)
+
+
+def close_image_executor() -> None:
+    global IMAGE_EXECUTOR
+    if IMAGE_EXECUTOR is not None:
+        IMAGE_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        IMAGE_EXECUTOR = None
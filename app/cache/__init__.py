@@ -1,9 +1,15 @@
 # trunk-ignore-all(ruff)
 
-from .card_data import CardData, get_card_data
-from .cleaner_jobs import (card_data_cache_job, feedbacks_cache_job,
-                           games_cache_job, roles_cache_job, users_cache_job)
+from .card_data import (CardData, get_cached_card_data, get_card_data,
+                        get_card_file_id, load_card_file_ids,
+                        peek_card_file_id, remove_card_file_id,
+                        search_inline_card_names, set_card_file_id)
 from .feedbacks import get_feedbacks, insert_feedback
 from .game_data import get_guess_game_rankings, insert_guess_game_scores
-from .users import (get_user, has_role, insert_role, insert_user, remove_role,
-                    update_user_date, update_user_info)
+from .lru_cache import LRUCache
+from .post_quota import (consume_post_quota, flush_post_quota,
+                         has_sent_post_today, post_quota_job,
+                         post_quota_reset_job)
+from .users import (flush_user_info, get_user, has_role, insert_role,
+                    insert_user, load_role_index, remove_role,
+                    update_user_date, update_user_info, user_info_job)
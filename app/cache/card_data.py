@@ -1,49 +1,112 @@
+import asyncio
 from dataclasses import dataclass
-from datetime import datetime
 
-from app.api import CardData, fetch_card_data
+from app import database as db
+from app.api import (CardData, fetch_card_data, normalize_card_name,
+                     search_card_names)
+from app.constants import CacheExpiry, CacheLimits, InlineSearch
 
-
-@dataclass
-class CardDataEntry:
-    card_data: CardData | None
-    time: datetime
-
-
-@dataclass
-class CardNameEntry:
-    card_name: str | None
-    time: datetime
+from .lru_cache import LRUCache
 
 
 @dataclass
 class CardDataCache:
-    cards: dict[str, CardDataEntry]
-    words: dict[str, CardNameEntry]
+    cards: LRUCache[str, CardData]
+    words: LRUCache[str, str | None]
+    requests: dict[str, asyncio.Task[CardData | None]]
+    file_ids: LRUCache[tuple[str, str], str]
+    inline_queries: LRUCache[str, list[str]]
 
 
-search_cache = CardDataCache(cards={}, words={})
+search_cache = CardDataCache(
+    cards=LRUCache(
+        ttl=CacheExpiry.CARD_DATA,
+        max_weight=CacheLimits.MAX_CARD_DATA_BYTES,
+        weigher=lambda card_data: len(card_data.image_bytes) + len(card_data.desc),
+    ),
+    words=LRUCache(
+        max_size=CacheLimits.MAX_SEARCH_WORD_SIZE, ttl=CacheExpiry.CARD_DATA
+    ),
+    requests={},
+    file_ids=LRUCache(max_size=CacheLimits.MAX_CARD_FILE_ID_SIZE),
+    inline_queries=LRUCache(
+        max_size=CacheLimits.MAX_INLINE_QUERY_SIZE, ttl=CacheExpiry.INLINE_QUERY
+    ),
+)
 
 
 async def get_card_data(search_word: str) -> CardData | None:
-    if card_name_entry := search_cache.words.get(search_word):
-        if card_name_entry.card_name is None:
+    search_word = normalize_card_name(search_word)
+    if search_word in search_cache.words:
+        card_name = search_cache.words.get(search_word)
+        if card_name is None:
             return None
-        if card_data_entry := search_cache.cards.get(card_name_entry.card_name):
-            return card_data_entry.card_data
+        if card_data := search_cache.cards.get(card_name):
+            return card_data
+
+    # Concurrent misses for the same word share a single fetch
+    request = search_cache.requests.get(search_word)
+    if request is None:
+        request = asyncio.create_task(fetch_and_cache_card_data(search_word))
+        search_cache.requests[search_word] = request
+        request.add_done_callback(
+            lambda _: search_cache.requests.pop(search_word, None)
+        )
+    return await asyncio.shield(request)
 
+
+async def fetch_and_cache_card_data(search_word: str) -> CardData | None:
     card_data = await fetch_card_data(search_word=search_word)
 
     if card_data is None:
-        search_cache.words[search_word] = CardNameEntry(
-            card_name=None, time=datetime.now()
-        )
+        search_cache.words.set(search_word, None)
     else:
-        search_cache.words[search_word] = CardNameEntry(
-            card_name=card_data.name, time=datetime.now()
-        )
-        search_cache.cards[card_data.name] = CardDataEntry(
-            card_data=card_data, time=datetime.now()
-        )
+        search_cache.words.set(search_word, card_data.name)
+        search_cache.cards.set(card_data.name, card_data)
 
     return card_data
+
+
+def get_cached_card_data(card_name: str) -> CardData | None:
+    return search_cache.cards.get(card_name)
+
+
+def search_inline_card_names(search_word: str) -> list[str]:
+    search_word = normalize_card_name(search_word)
+    card_names = search_cache.inline_queries.get(search_word)
+    if card_names is None:
+        card_names = search_card_names(search_word, InlineSearch.MAX_RESULTS)
+        search_cache.inline_queries.set(search_word, card_names)
+    return card_names
+
+
+def peek_card_file_id(card_name: str, variant: str = "full") -> str | None:
+    return search_cache.file_ids.get((card_name, variant))
+
+
+async def load_card_file_ids(variant: str = "full") -> None:
+    file_ids = await db.get_card_file_ids(
+        variant=variant, limit=CacheLimits.MAX_CARD_FILE_ID_SIZE
+    )
+    for card_name, file_id in file_ids.items():
+        search_cache.file_ids.set((card_name, variant), file_id)
+
+
+async def get_card_file_id(card_name: str, variant: str = "full") -> str | None:
+    if file_id := search_cache.file_ids.get((card_name, variant)):
+        return file_id
+
+    file_id = await db.get_card_file_id(card_name=card_name, variant=variant)
+    if file_id:
+        search_cache.file_ids.set((card_name, variant), file_id)
+    return file_id
+
+
+async def set_card_file_id(card_name: str, file_id: str, variant: str = "full") -> None:
+    await db.insert_card_file_id(card_name=card_name, variant=variant, file_id=file_id)
+    search_cache.file_ids.set((card_name, variant), file_id)
+
+
+async def remove_card_file_id(card_name: str, variant: str = "full") -> None:
+    await db.delete_card_file_id(card_name=card_name, variant=variant)
+    search_cache.file_ids.pop((card_name, variant))
@@ -2,36 +2,34 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from app import database as db
+from app.constants import CacheExpiry, CacheLimits
 
-
-@dataclass
-class SellerEntry:
-    feedbacks: list[db.Feedback]
-    time: datetime
+from .lru_cache import LRUCache
 
 
 @dataclass
 class FeedbacksCache:
-    sellers: dict[int, SellerEntry]
+    sellers: LRUCache[int, list[db.Feedback]]
 
 
-feedbacks_cache = FeedbacksCache(sellers={})
+feedbacks_cache = FeedbacksCache(
+    sellers=LRUCache(max_size=CacheLimits.MAX_FEEDBACK_SIZE, ttl=CacheExpiry.FEEDBACK)
+)
 
 
-def insert_feedback(
+async def insert_feedback(
     seller_id: int, buyer_id: int, contents: str, date: datetime
 ) -> None:
-    db.insert_feedback(
+    await db.insert_feedback(
         seller_id=seller_id, buyer_id=buyer_id, contents=contents, date=date
     )
-    if feedbacks_cache.sellers.get(seller_id):
-        del feedbacks_cache.sellers[seller_id]
+    feedbacks_cache.sellers.pop(seller_id)
 
 
-def get_feedbacks(seller_id: int) -> list[db.Feedback]:
-    if seller_entry := feedbacks_cache.sellers.get(seller_id):
-        return seller_entry.feedbacks
+async def get_feedbacks(seller_id: int) -> list[db.Feedback]:
+    if (feedbacks := feedbacks_cache.sellers.get(seller_id)) is not None:
+        return feedbacks
 
-    feedbacks = db.get_feedbacks(seller_id=seller_id)
-    feedbacks_cache[seller_id] = SellerEntry(feedbacks=feedbacks, time=datetime.now())
+    feedbacks = await db.get_feedbacks(seller_id=seller_id)
+    feedbacks_cache.sellers.set(seller_id, feedbacks)
     return feedbacks
@@ -2,36 +2,38 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from app import database as db
+from app.constants import CacheExpiry, CacheLimits
 
-
-@dataclass
-class GuessGameRankingsEntry:
-    rankings: dict[int, int]
-    time: datetime
+from .lru_cache import LRUCache
 
 
 @dataclass
 class GamesCache:
-    guess_game_rankings: dict[int, GuessGameRankingsEntry]
+    guess_game_rankings: LRUCache[int, dict[int, int]]
 
 
-games_cache = GamesCache(guess_game_rankings={})
+games_cache = GamesCache(
+    guess_game_rankings=LRUCache(
+        max_size=CacheLimits.MAX_GUESS_GAME_RANKINGS_SIZE,
+        ttl=CacheExpiry.GUESS_GAME_RANKINGS,
+    )
+)
 
 
-def insert_guess_game_scores(game_time: datetime, scores: dict[int, int]) -> None:
-    db.insert_game(date=game_time)
+async def insert_guess_game_scores(game_time: datetime, scores: dict[int, int]) -> None:
+    await db.insert_game(date=game_time)
     for user_id, score in scores.items():
         if score > 0:
-            db.insert_user_score(user_id=user_id, score=score, game_date=game_time)
-    games_cache.guess_game_rankings = {}
+            await db.insert_user_score(
+                user_id=user_id, score=score, game_date=game_time
+            )
+    games_cache.guess_game_rankings.clear()
 
 
-def get_guess_game_rankings(length: int) -> dict[int, int]:
-    if rankings_entry := games_cache.guess_game_rankings.get(length):
-        return rankings_entry.rankings
+async def get_guess_game_rankings(length: int) -> dict[int, int]:
+    if (rankings := games_cache.guess_game_rankings.get(length)) is not None:
+        return rankings
 
-    rankings = db.get_guess_game_rankings(length=length)
-    games_cache.guess_game_rankings[length] = GuessGameRankingsEntry(
-        rankings=rankings, time=datetime.now()
-    )
+    rankings = await db.get_guess_game_rankings(length=length)
+    games_cache.guess_game_rankings.set(length, rankings)
     return rankings
@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Callable, Iterator
+
+
+class LRUCache[K, V]:
+    def __init__(
+        self,
+        max_size: int | None = None,
+        ttl: timedelta | None = None,
+        max_weight: int | None = None,
+        weigher: Callable[[V], int] | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.weight = 0
+        self._entries: OrderedDict[K, tuple[V, float | None, int]] = OrderedDict()
+
+    def _expires_at(self, ttl: timedelta | None) -> float | None:
+        ttl = ttl if ttl is not None else self.ttl
+        return time.monotonic() + ttl.total_seconds() if ttl is not None else None
+
+    def _remove(self, key: K) -> tuple[V, float | None, int] | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[2]
+        return entry
+
+    def _is_full(self) -> bool:
+        if self.max_size is not None and len(self._entries) > self.max_size:
+            return True
+        if self.max_weight is not None and self.weight > self.max_weight:
+            return True
+        return False
+
+    def get[D](self, key: K, default: D = None) -> V | D:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: timedelta | None = None) -> None:
+        self._remove(key)
+        weight = self.weigher(value) if self.weigher is not None else 1
+        self._entries[key] = (value, self._expires_at(ttl), weight)
+        self.weight += weight
+        # The newest entry is kept even if it alone exceeds the weight budget
+        while len(self._entries) > 1 and self._is_full():
+            self._remove(next(iter(self._entries)))
+
+    def pop[D](self, key: K, default: D = None) -> V | D:
+        entry = self._remove(key)
+        return entry[0] if entry is not None else default
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.weight = 0
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        expires_at = entry[1]
+        return expires_at is None or expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(list(self._entries.keys()))
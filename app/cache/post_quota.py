@@ -0,0 +1,109 @@
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Literal
+
+from telegram.ext import ContextTypes
+
+from app import database as db
+
+type PostKind = Literal["buy", "sell"]
+type PostDates = tuple[datetime | None, datetime | None]
+
+
+@dataclass
+class PostQuotaLedger:
+    day: date
+    used: set[tuple[int, PostKind]]
+    pending: dict[int, PostDates]
+    flushing: dict[int, PostDates]
+
+
+post_quota = PostQuotaLedger(day=date.today(), used=set(), pending={}, flushing={})
+
+
+def reset_post_quota_day() -> None:
+    today = date.today()
+    if post_quota.day != today:
+        post_quota.day = today
+        post_quota.used = set()
+
+
+def get_last_post(user: db.User, kind: PostKind) -> datetime:
+    return user.last_buy_post if kind == "buy" else user.last_sell_post
+
+
+def has_sent_post_today(user: db.User, kind: PostKind) -> bool:
+    reset_post_quota_day()
+    if (user.id, kind) in post_quota.used:
+        return True
+    return get_last_post(user, kind).date() == post_quota.day
+
+
+def consume_post_quota(user: db.User, kind: PostKind) -> bool:
+    # Check and consume never yield to the event loop, so two posts sent at
+    # the same time can't both get through
+    if has_sent_post_today(user, kind):
+        return False
+
+    now = datetime.now()
+    post_quota.used.add((user.id, kind))
+    last_buy_post, last_sell_post = post_quota.pending.get(user.id, (None, None))
+    if kind == "buy":
+        user.last_buy_post = last_buy_post = now
+    else:
+        user.last_sell_post = last_sell_post = now
+    post_quota.pending[user.id] = (last_buy_post, last_sell_post)
+    return True
+
+
+def drop_post_date(post_dates: dict[int, PostDates], id: int, kind: PostKind) -> None:
+    if (user_post_dates := post_dates.pop(id, None)) is None:
+        return
+    last_buy_post, last_sell_post = user_post_dates
+    if kind == "buy":
+        last_buy_post = None
+    else:
+        last_sell_post = None
+    if last_buy_post or last_sell_post:
+        post_dates[id] = (last_buy_post, last_sell_post)
+
+
+def release_post_quota(id: int, kind: PostKind) -> None:
+    post_quota.used.discard((id, kind))
+    drop_post_date(post_quota.pending, id, kind)
+    # A failed flush must not bring the released date back
+    drop_post_date(post_quota.flushing, id, kind)
+
+
+def merge_post_dates(older: PostDates, newer: PostDates) -> PostDates:
+    return (newer[0] or older[0], newer[1] or older[1])
+
+
+async def flush_post_quota() -> None:
+    if len(post_quota.pending) == 0:
+        return
+    post_quota.flushing = post_quota.pending
+    post_quota.pending = {}
+    written = await db.update_users_post_dates(
+        [(id, *post_dates) for id, post_dates in post_quota.flushing.items()]
+    )
+    flushing = post_quota.flushing
+    post_quota.flushing = {}
+    if written:
+        return
+
+    logging.log(logging.ERROR, f"Could not flush {len(flushing)} post dates")
+    # Requeued, otherwise the posts would be allowed again after a restart
+    for id, post_dates in flushing.items():
+        if (newer_post_dates := post_quota.pending.get(id)) is not None:
+            post_dates = merge_post_dates(post_dates, newer_post_dates)
+        post_quota.pending[id] = post_dates
+
+
+async def post_quota_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    await flush_post_quota()
+
+
+async def post_quota_reset_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    reset_post_quota_day()
@@ -1,38 +1,58 @@
+import logging
 from dataclasses import dataclass
 from datetime import datetime
 
-from app import database as db
-from app.constants import Dates
-
+from telegram.ext import ContextTypes
 
-@dataclass
-class UserEntry:
-    user: db.User
-    time: datetime
+from app import database as db
+from app.constants import CacheExpiry, CacheLimits, Dates
 
+from .lru_cache import LRUCache
+from .post_quota import release_post_quota
 
-@dataclass
-class UserRolesEntry:
-    roles: set[db.Role]
-    time: datetime
+type UserInfo = tuple[str | None, str | None, str | None]
 
 
 @dataclass
 class UsersCache:
-    users: dict[int, UserEntry]
-    ids: dict[str, int]
-    roles: dict[int, UserRolesEntry]
-
-
-users_cache = UsersCache(users={}, ids={}, roles={})
-
-
-def insert_user(
+    users: LRUCache[int, db.User]
+    ids: LRUCache[str, int]
+    roles: dict[int, set[db.Role]]
+    pending_info: dict[int, UserInfo]
+    missing_ids: LRUCache[int, bool]
+    missing_usernames: LRUCache[str, bool]
+
+
+users_cache = UsersCache(
+    users=LRUCache(max_size=CacheLimits.MAX_USER_SIZE, ttl=CacheExpiry.USER),
+    ids=LRUCache(max_size=CacheLimits.MAX_USERNAME_SIZE, ttl=CacheExpiry.USER),
+    roles={},
+    pending_info={},
+    missing_ids=LRUCache(
+        max_size=CacheLimits.MAX_MISSING_USER_SIZE, ttl=CacheExpiry.MISSING_USER
+    ),
+    missing_usernames=LRUCache(
+        max_size=CacheLimits.MAX_MISSING_USER_SIZE, ttl=CacheExpiry.MISSING_USER
+    ),
+)
+
+
+def unset_missing(id: int, username: str | None) -> None:
+    users_cache.missing_ids.pop(id)
+    if username:
+        users_cache.missing_usernames.pop(username)
+
+
+async def insert_user(
     id: int, username: str | None, first_name: str | None, last_name: str | None
 ) -> None:
-    db.insert_user(id=id, username=username, first_name=first_name, last_name=last_name)
-    users_cache.users[id] = UserEntry(
-        user=db.User(
+    await db.insert_user(
+        id=id, username=username, first_name=first_name, last_name=last_name
+    )
+    unset_missing(id, username)
+    users_cache.users.set(
+        id,
+        db.User(
             (
                 id,
                 username,
@@ -42,87 +62,122 @@ def insert_user(
                 Dates.MARKET_EPOCH,
             )
         ),
-        time=datetime.now(),
     )
-    users_cache.ids[username] = id
+    if username:
+        users_cache.ids.set(username, id)
 
 
-def get_user(id: int | None = None, username: str | None = None) -> db.User | None:
+async def get_user(
+    id: int | None = None, username: str | None = None
+) -> db.User | None:
     if id:
-        if user_entry := users_cache.users.get(id):
-            return user_entry.user
-        elif user := db.get_user_from_id(id=id):
-            users_cache.users[id] = UserEntry(user=user, time=datetime.now())
+        if user := users_cache.users.get(id):
             return user
+        elif id in users_cache.missing_ids:
+            return None
+        elif user := await db.get_user_from_id(id=id):
+            users_cache.users.set(id, user)
+            return user
+        users_cache.missing_ids.set(id, True)
 
     elif username:
         if id := users_cache.ids.get(username):
-            if user_entry := users_cache.users.get(id):
-                return user_entry.user
-            user = db.get_user_from_id(id=id)
+            if user := users_cache.users.get(id):
+                return user
+            user = await db.get_user_from_id(id=id)
             if user:
-                users_cache.users[id] = UserEntry(user=user, time=datetime.now())
+                users_cache.users.set(id, user)
 
             return user
-        elif user := db.get_user_from_username(username=username):
-            users_cache.ids[username] = user.id
-            users_cache.users[user.id] = UserEntry(user=user, time=datetime.now())
+        elif username in users_cache.missing_usernames:
+            return None
+        elif user := await db.get_user_from_username(username=username):
+            users_cache.ids.set(username, user.id)
+            users_cache.users.set(user.id, user)
             return user
+        users_cache.missing_usernames.set(username, True)
 
 
-def update_user_info(
+async def update_user_info(
     id: int, username: str | None, first_name: str | None, last_name: str | None
 ) -> None:
-    db.update_user_info(
-        id=id, username=username, first_name=first_name, last_name=last_name
-    )
-    users_cache.ids[username] = id
-    users_cache.users[id].user.username = username
-    users_cache.users[id].user.first_name = first_name
-    users_cache.users[id].user.last_name = last_name
+    unset_missing(id, username)
+    user = await get_user(id=id)
+    if user is None:
+        return
+    if (user.username, user.first_name, user.last_name) == (
+        username,
+        first_name,
+        last_name,
+    ):
+        return
+
+    if user.username and users_cache.ids.get(user.username) == id:
+        users_cache.ids.pop(user.username)
+    if username:
+        users_cache.ids.set(username, id)
+    user.username = username
+    user.first_name = first_name
+    user.last_name = last_name
+    users_cache.pending_info[id] = (username, first_name, last_name)
+
+
+async def flush_user_info() -> None:
+    if len(users_cache.pending_info) == 0:
+        return
+    pending_info = users_cache.pending_info
+    users_cache.pending_info = {}
+    if not await db.update_users_info(
+        [(id, *user_info) for id, user_info in pending_info.items()]
+    ):
+        logging.log(
+            logging.ERROR, f"Could not flush {len(pending_info)} user info updates"
+        )
+        # Kept for the next flush, info queued during the write is newer
+        users_cache.pending_info = pending_info | users_cache.pending_info
+
+
+async def user_info_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    await flush_user_info()
 
 
-def update_user_date(
+async def update_user_date(
     id: int,
     last_buy_post: datetime | None = None,
     last_sell_post: datetime | None = None,
 ) -> None:
+    # Explicit dates override whatever the quota ledger holds for the user
     if last_buy_post:
-        db.update_user_last_buy_post(id=id, last_buy_post=last_buy_post)
-        if users_cache.users.get(id):
-            users_cache.users[id].user.last_buy_post = last_buy_post
+        release_post_quota(id, "buy")
+        await db.update_user_last_buy_post(id=id, last_buy_post=last_buy_post)
+        if user := users_cache.users.get(id):
+            user.last_buy_post = last_buy_post
 
     if last_sell_post:
-        db.update_user_last_sell_post(id=id, last_sell_post=last_sell_post)
-        if users_cache.users.get(id):
-            users_cache.users[id].user.last_sell_post = last_sell_post
-
-
-def insert_role(id: int, role_name: db.Role) -> None:
-    db.insert_role(user_id=id, role_name=role_name)
-    if users_cache.roles.get(id):
-        users_cache.roles[id].roles.add(role_name)
-        users_cache.roles[id].time = datetime.now()
-    else:
-        users_cache.roles[id] = UserRolesEntry(
-            roles=set(role_name), time=datetime.now()
-        )
+        release_post_quota(id, "sell")
+        await db.update_user_last_sell_post(id=id, last_sell_post=last_sell_post)
+        if user := users_cache.users.get(id):
+            user.last_sell_post = last_sell_post
+
+
+async def load_role_index() -> None:
+    users_cache.roles = await db.get_all_roles()
+
+
+async def insert_role(id: int, role_name: db.Role) -> None:
+    await db.insert_role(user_id=id, role_name=role_name)
+    users_cache.roles.setdefault(id, set()).add(role_name)
 
 
-def remove_role(id: int, role_name: db.Role) -> None:
-    db.remove_role(user_id=id, role_name=role_name)
-    if roles_entry := users_cache.roles.get(id):
-        if role_name in roles_entry.roles:
-            users_cache.roles[id].roles.remove(role_name)
+async def remove_role(id: int, role_name: db.Role) -> None:
+    await db.remove_role(user_id=id, role_name=role_name)
+    if roles := users_cache.roles.get(id):
+        roles.discard(role_name)
+        if len(roles) == 0:
+            del users_cache.roles[id]
 
 
 def has_role(id: int, role_name: db.Role) -> bool:
-    if roles_entry := users_cache.roles.get(id):
-        if role_name in roles_entry.roles:
-            return True
-        else:
-            return False
-
-    roles = db.get_roles(user_id=id)
-    users_cache.roles[id] = UserRolesEntry(roles=roles, time=datetime.now())
-    return True if role_name in roles else False
+    if roles := users_cache.roles.get(id):
+        return True if role_name in roles else False
+    return False
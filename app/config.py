@@ -2,6 +2,7 @@ import json
 import logging
 import os
 import sys
+from functools import cache
 
 
 def load_configs() -> dict:
@@ -20,37 +21,46 @@ def load_configs() -> dict:
 GLOBAL_CONFIGS: dict = load_configs()
 
 
+@cache
 def main_id() -> int:
     return int(GLOBAL_CONFIGS["group_info"]["main_id"])
 
 
+@cache
 def market_id() -> int:
     return int(GLOBAL_CONFIGS["group_info"]["market_id"])
 
 
+@cache
 def approval_id() -> int:
     return int(GLOBAL_CONFIGS["group_info"]["approval_id"])
 
 
+@cache
 def feedback_channel_id() -> int:
     return int(GLOBAL_CONFIGS["channel_info"]["feedback_id"])
 
 
+@cache
 def logging_channel_id() -> int:
     return int(GLOBAL_CONFIGS["channel_info"]["logging_id"])
 
 
+@cache
 def photo_storage_id() -> int:
     return int(GLOBAL_CONFIGS["channel_info"]["photo_storage_id"])
 
 
+@cache
 def market_plus_id() -> int:
     return int(GLOBAL_CONFIGS["channel_info"]["market_plus_id"])
 
 
+@cache
 def debug_user_id() -> int:
     return int(GLOBAL_CONFIGS["debug_user_id"])
 
 
+@cache
 def market_group_link() -> str:
     return str(GLOBAL_CONFIGS["links"]["market_group_link"])
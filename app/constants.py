@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.config import market_group_link
 
@@ -22,22 +22,100 @@ class Dates:
 class CacheLimits:
     MAX_USER_SIZE = 9999
     MAX_USERNAME_SIZE = 9999
-    MAX_ROLE_SIZE = 9999
-    MAX_CARD_DATA_SIZE = 499
+    MAX_CARD_DATA_BYTES = 32 * 1024 * 1024
     MAX_GUESS_GAME_RANKINGS_SIZE = 999
     MAX_SEARCH_WORD_SIZE = 9999
+    MAX_CARD_FILE_ID_SIZE = 9999
     MAX_FEEDBACK_SIZE = 1999
+    MAX_MISSING_USER_SIZE = 4999
+    MAX_INLINE_QUERY_SIZE = 9999
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class CacheExpiry:
+    USER = timedelta(days=1)
+    CARD_DATA = timedelta(days=1)
+    GUESS_GAME_RANKINGS = timedelta(days=1)
+    FEEDBACK = timedelta(days=1)
+    MISSING_USER = timedelta(minutes=5)
+    INLINE_QUERY = timedelta(hours=1)
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class HttpLimits:
+    TIMEOUT = 10.0
+    CONNECT_TIMEOUT = 5.0
+    MAX_CONNECTIONS = 10
+    MAX_KEEPALIVE_CONNECTIONS = 5
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class MediaGroups:
+    QUIET_PERIOD = 1.0
+    MAX_DELAY = 5.0
+    TICK_LENGTH = 0.25
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class CardStoreLimits:
+    REFRESH_INTERVAL = 86400
+    DUMP_TIMEOUT = 120.0
+    MIN_DUMP_SIZE = 1000
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class CardSuggestions:
+    MAX_SIZE = 5
+    MIN_SCORE = 0.3
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class InlineSearch:
+    MAX_RESULTS = 10
+    MIN_QUERY_LENGTH = 2
+    MAX_QUERY_LENGTH = 40
+    CACHE_TIME = 300
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class ImageWorker:
+    MAX_WORKERS = 2
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class CardImage:
+    FORMAT = "JPEG"
+    QUALITY = 85
+    KEPT_FORMATS = ("JPEG", "WEBP")
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class UpdateProcessing:
+    MAX_CONCURRENT_UPDATES = 16
+    MAX_PENDING_UPDATES = 256
+
+
+@dataclass(frozen=True, init=False, eq=False, repr=False)
+class WriteBehind:
+    USER_INFO_FLUSH_INTERVAL = 5
+    POST_QUOTA_FLUSH_INTERVAL = 5
 
 
 @dataclass(frozen=True, init=False, eq=False, repr=False)
 class GuessGame:
     GAME_LENGTH = 10
     CORRECT_THRESHOLD = 0.90
+    PREFETCH_ROUNDS = 2
+    FIRST_ROUND_DELAY = 15
+    ROUND_DELAY = 10
+    HINT_INTERVAL = 15
 
 
 @dataclass(frozen=True, init=False, eq=False, repr=False)
 class MessageLimits:
     MAX_USERNAME_LENGTH = 32
+    MAX_CAPTION_LENGTH = 1024
+    MAX_DELETE_MESSAGES = 100
 
 
 @dataclass(frozen=True, init=False, eq=False, repr=False)
@@ -1,20 +1,27 @@
 # trunk-ignore-all(ruff)
 
+from .base import close_async_pool, close_pool, open_async_pool
+from .card_file import (delete_card_file_id, get_card_file_id,
+                        get_card_file_ids, insert_card_file_id)
 from .feedback import get_feedbacks, insert_feedback
+from .game_state import delete_game_state, get_saved_games, save_game_state
 from .guess_game import get_guess_game_rankings, insert_game, insert_user_score
 from .market_plus_post import (get_posts_to_delete, get_posts_to_send,
                                insert_market_plus_post,
                                update_delete_market_plus_post,
                                update_posted_date)
-from .models import Feedback, MarketPlusPost, Role, User
-from .role import get_roles, insert_role, remove_role
+from .models import Feedback, MarketPlusPost, Role, SavedGame, User
+from .role import get_all_roles, get_roles, insert_role, remove_role
 from .user import (get_all_users, get_user_from_id, get_user_from_username,
                    insert_user, update_user_info, update_user_last_buy_post,
-                   update_user_last_sell_post)
+                   update_user_last_sell_post, update_users_info,
+                   update_users_post_dates)
 
 
 def create_database() -> None:
+    from .card_file import create_card_file_table
     from .feedback import create_feedback_table
+    from .game_state import create_game_state_table
     from .guess_game import create_guess_game_table
     from .market_plus_post import create_market_plus_post_table
     from .role import create_role_table
@@ -25,3 +32,5 @@ def create_database() -> None:
     create_role_table()
     create_guess_game_table()
     create_market_plus_post_table()
+    create_card_file_table()
+    create_game_state_table()
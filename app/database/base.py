@@ -1,17 +1,88 @@
 import os
+from contextlib import AbstractContextManager, asynccontextmanager
+from typing import AsyncIterator
 
 import psycopg
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
+POOL: ConnectionPool | None = None
+ASYNC_POOL: AsyncConnectionPool | None = None
 
-def get_connection() -> psycopg.Connection:
+
+def get_conninfo() -> str:
     host = os.getenv("DB_HOST")
     name = os.getenv("DB_NAME")
     user = os.getenv("DB_USER")
     password = os.getenv("DB_PASSWORD")
 
-    return psycopg.connect(
-        f"""host={host}
+    return f"""host={host}
         dbname={name}
         user={user}
         password={password}"""
-    )
+
+
+def get_pool_min_size() -> int:
+    return int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+
+
+def get_pool_max_size() -> int:
+    return int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+
+
+def get_pool() -> ConnectionPool:
+    global POOL
+    if POOL is None:
+        POOL = ConnectionPool(
+            conninfo=get_conninfo(),
+            min_size=get_pool_min_size(),
+            max_size=get_pool_max_size(),
+            check=ConnectionPool.check_connection,
+            name="hexa-bot",
+            open=True,
+        )
+    return POOL
+
+
+def get_connection() -> AbstractContextManager[psycopg.Connection]:
+    return get_pool().connection()
+
+
+def close_pool() -> None:
+    global POOL
+    if POOL is not None:
+        POOL.close()
+        POOL = None
+
+
+def get_async_pool() -> AsyncConnectionPool:
+    global ASYNC_POOL
+    if ASYNC_POOL is None:
+        ASYNC_POOL = AsyncConnectionPool(
+            conninfo=get_conninfo(),
+            min_size=get_pool_min_size(),
+            max_size=get_pool_max_size(),
+            check=AsyncConnectionPool.check_connection,
+            name="hexa-bot-async",
+            open=False,
+        )
+    return ASYNC_POOL
+
+
+async def open_async_pool() -> None:
+    pool = get_async_pool()
+    if pool.closed:
+        await pool.open()
+
+
+@asynccontextmanager
+async def get_async_connection() -> AsyncIterator[psycopg.AsyncConnection]:
+    await open_async_pool()
+    async with get_async_pool().connection() as conn:
+        yield conn
+
+
+async def close_async_pool() -> None:
+    global ASYNC_POOL
+    if ASYNC_POOL is not None:
+        await ASYNC_POOL.close()
+        ASYNC_POOL = None
@@ -0,0 +1,100 @@
+import logging
+
+import psycopg
+
+from .base import get_async_connection, get_connection
+
+
+def create_card_file_table() -> None:
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS card_file(
+                    card_name TEXT,
+                    variant TEXT,
+                    file_id TEXT NOT NULL,
+                    CONSTRAINT card_file_pk
+                        PRIMARY KEY (card_name, variant)
+                );
+                """
+            )
+
+
+async def insert_card_file_id(card_name: str, variant: str, file_id: str) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                await cur.execute(
+                    """
+                INSERT INTO card_file(
+                    card_name,
+                    variant,
+                    file_id
+                ) VALUES (%s, %s, %s)
+                ON CONFLICT (card_name, variant)
+                DO UPDATE SET file_id=EXCLUDED.file_id;
+                """,
+                    (card_name, variant, file_id),
+                )
+            except psycopg.Error as err:
+                logging.log(logging.ERROR, err)
+
+
+async def get_card_file_id(card_name: str, variant: str) -> str | None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                await cur.execute(
+                    """
+                    SELECT file_id
+                    FROM card_file
+                    WHERE card_name=%s AND variant=%s;
+                """,
+                    (card_name, variant),
+                )
+            except psycopg.Error as err:
+                logging.log(logging.ERROR, err)
+            record = await cur.fetchone()
+            if record is None:
+                return None
+            try:
+                return str(record[0].decode("utf-8"))
+            except AttributeError:
+                return str(record[0])
+
+
+async def get_card_file_ids(variant: str, limit: int) -> dict[str, str]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                await cur.execute(
+                    """
+                    SELECT card_name, file_id
+                    FROM card_file
+                    WHERE variant=%s
+                    LIMIT %s;
+                """,
+                    (variant, limit),
+                )
+            except psycopg.Error as err:
+                logging.log(logging.ERROR, err)
+            file_ids: dict[str, str] = {}
+            for record in await cur.fetchall():
+                file_ids[str(record[0])] = str(record[1])
+            return file_ids
+
+
+async def delete_card_file_id(card_name: str, variant: str) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                await cur.execute(
+                    """
+                    DELETE FROM card_file
+                    WHERE card_name=%s AND variant=%s;
+                """,
+                    (card_name, variant),
+                )
+            except psycopg.Error as err:
+                logging.log(logging.ERROR, err)
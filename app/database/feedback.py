@@ -3,7 +3,7 @@ from datetime import datetime
 
 import psycopg
 
-from .base import get_connection
+from .base import get_async_connection, get_connection
 from .models import Feedback
 
 
@@ -31,13 +31,13 @@ def create_feedback_table() -> None:
             )
 
 
-def insert_feedback(
+async def insert_feedback(
     seller_id: int, buyer_id: int, contents: str, date: datetime
 ) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                 INSERT INTO feedback(
                     seller_id,
@@ -50,15 +50,13 @@ def insert_feedback(
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            conn.commit()
-            conn.close()
 
 
-def get_feedbacks(seller_id: int) -> list[Feedback]:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def get_feedbacks(seller_id: int) -> list[Feedback]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT id, seller_id, buyer_id, contents, date
                     FROM feedback
@@ -68,6 +66,5 @@ def get_feedbacks(seller_id: int) -> list[Feedback]:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            feedbacks = [Feedback(record) for record in cur.fetchall()]
-            conn.close()
+            feedbacks = [Feedback(record) for record in await cur.fetchall()]
             return feedbacks
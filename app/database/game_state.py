@@ -0,0 +1,79 @@
+import logging
+from datetime import datetime
+
+import psycopg
+from psycopg.types.json import Jsonb
+
+from .base import get_async_connection, get_connection
+from .models import SavedGame
+
+
+def create_game_state_table() -> None:
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS game_state(
+                    chat_id NUMERIC PRIMARY KEY,
+                    game_type TEXT NOT NULL,
+                    start_time TIMESTAMP NOT NULL,
+                    data JSONB NOT NULL
+                );
+                """
+            )
+
+
+async def save_game_state(
+    chat_id: int, game_type: str, start_time: datetime, data: dict
+) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                await cur.execute(
+                    """
+                INSERT INTO game_state(
+                    chat_id,
+                    game_type,
+                    start_time,
+                    data
+                ) VALUES (%s, %s, %s, %s)
+                ON CONFLICT (chat_id)
+                DO UPDATE SET
+                    game_type=EXCLUDED.game_type,
+                    start_time=EXCLUDED.start_time,
+                    data=EXCLUDED.data;
+                """,
+                    (chat_id, game_type, start_time, Jsonb(data)),
+                )
+            except psycopg.Error as err:
+                logging.log(logging.ERROR, err)
+
+
+async def delete_game_state(chat_id: int) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                await cur.execute(
+                    """
+                    DELETE FROM game_state
+                    WHERE chat_id=%s;
+                """,
+                    (chat_id,),
+                )
+            except psycopg.Error as err:
+                logging.log(logging.ERROR, err)
+
+
+async def get_saved_games() -> list[SavedGame]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                await cur.execute(
+                    """
+                    SELECT chat_id, game_type, start_time, data
+                    FROM game_state;
+                """
+                )
+            except psycopg.Error as err:
+                logging.log(logging.ERROR, err)
+            return [SavedGame(record) for record in await cur.fetchall()]
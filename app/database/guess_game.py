@@ -2,7 +2,7 @@ from datetime import datetime
 
 import psycopg
 
-from .base import get_connection
+from .base import get_async_connection, get_connection
 
 
 def create_guess_game_table() -> None:
@@ -33,15 +33,13 @@ def create_guess_game_table() -> None:
                 );
                 """
             )
-            conn.commit()
-            conn.close()
 
 
-def insert_game(date: datetime) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def insert_game(date: datetime) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                 INSERT INTO guess_game(
                     date
@@ -51,15 +49,13 @@ def insert_game(date: datetime) -> None:
                 )
             except psycopg.Error as err:
                 print(err)
-            conn.commit()
-            conn.close()
 
 
-def insert_user_score(user_id: int, score: int, game_date: datetime) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def insert_user_score(user_id: int, score: int, game_date: datetime) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                 INSERT INTO users_guess_game(user_id, game_id, user_score)
                     SELECT %s, guess_game.id, %s
@@ -70,15 +66,13 @@ def insert_user_score(user_id: int, score: int, game_date: datetime) -> None:
                 )
             except psycopg.Error as err:
                 print(err)
-            conn.commit()
-            conn.close()
 
 
-def get_guess_game_rankings(length: int) -> dict[int, int]:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def get_guess_game_rankings(length: int) -> dict[int, int]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                 SELECT users_guess_game.user_id, SUM(users_guess_game.user_score) as score
                 FROM users_guess_game
@@ -90,6 +84,5 @@ def get_guess_game_rankings(length: int) -> dict[int, int]:
                 )
             except psycopg.Error as err:
                 print(err)
-            scores = {user_id: score for user_id, score in cur.fetchall()}
-            conn.close()
+            scores = {user_id: score for user_id, score in await cur.fetchall()}
             return scores
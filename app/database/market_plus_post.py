@@ -5,7 +5,7 @@ import psycopg
 
 from app.constants import Dates
 
-from .base import get_connection
+from .base import get_async_connection, get_connection
 from .models import MarketPlusPost
 
 
@@ -23,15 +23,13 @@ def create_market_plus_post_table() -> None:
                         );
                         """
             )
-            conn.commit()
-            conn.close()
 
 
-def insert_market_plus_post(message_id: int, end_date: datetime) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def insert_market_plus_post(message_id: int, end_date: datetime) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                 INSERT INTO market_plus_post(
                     message_id,
@@ -43,17 +41,17 @@ def insert_market_plus_post(message_id: int, end_date: datetime) -> None:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            conn.commit()
-            conn.close()
 
 
-def update_posted_date(message_id: int, market_id: int, date: datetime = None) -> None:
+async def update_posted_date(
+    message_id: int, market_id: int, date: datetime = None
+) -> None:
     if date is None:
         date = datetime.now()
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     UPDATE market_plus_post
                     SET last_posted_date=%s, last_posted_market_id=%s
@@ -63,15 +61,13 @@ def update_posted_date(message_id: int, market_id: int, date: datetime = None) -
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            conn.commit()
-            conn.close()
 
 
-def update_delete_market_plus_post(message_id: int) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def update_delete_market_plus_post(message_id: int) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     UPDATE market_plus_post
                     SET is_deleted=TRUE
@@ -81,15 +77,13 @@ def update_delete_market_plus_post(message_id: int) -> None:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            conn.commit()
-            conn.close()
 
 
-def get_posts_to_send() -> list[MarketPlusPost]:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def get_posts_to_send() -> list[MarketPlusPost]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT message_id, end_date, last_posted_date, last_posted_market_id
                     FROM market_plus_post
@@ -99,16 +93,15 @@ def get_posts_to_send() -> list[MarketPlusPost]:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            posts = [MarketPlusPost(record) for record in cur.fetchall()]
-            conn.close()
+            posts = [MarketPlusPost(record) for record in await cur.fetchall()]
             return posts
 
 
-def get_posts_to_delete() -> list[MarketPlusPost]:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def get_posts_to_delete() -> list[MarketPlusPost]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT message_id, end_date, last_posted_date, last_posted_market_id
                     FROM market_plus_post
@@ -118,6 +111,5 @@ def get_posts_to_delete() -> list[MarketPlusPost]:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            posts = [MarketPlusPost(record) for record in cur.fetchall()]
-            conn.close()
+            posts = [MarketPlusPost(record) for record in await cur.fetchall()]
             return posts
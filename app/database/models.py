@@ -55,4 +55,15 @@ class MarketPlusPost:
         self.last_posted_date: datetime = post_data[2]
         self.last_posted_market_id: int | None = (
             int(post_data[3]) if post_data[3] is not None else None
-        )
\ No newline at end of file
+        )
+
+
+class SavedGame:
+    def __init__(self, game_data: tuple) -> None:
+        self.chat_id: int = int(game_data[0])
+        try:
+            self.game_type: str = game_data[1].decode("utf-8")
+        except AttributeError:
+            self.game_type: str = game_data[1]
+        self.start_time: datetime = game_data[2]
+        self.data: dict = dict(game_data[3])
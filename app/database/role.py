@@ -4,7 +4,7 @@ import psycopg
 
 from app.constants import Roles
 
-from .base import get_connection
+from .base import get_async_connection, get_connection
 from .models import Role
 
 
@@ -55,15 +55,13 @@ def create_role_table() -> None:
                 """,
                     (role, role),
                 )
-            conn.commit()
-            conn.close()
 
 
-def insert_role(user_id: int, role_name: Role) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def insert_role(user_id: int, role_name: Role) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     INSERT INTO users_role(user_id, role_id)
                     SELECT %s, role.id
@@ -74,15 +72,13 @@ def insert_role(user_id: int, role_name: Role) -> None:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            conn.commit()
-            conn.close()
 
 
-def remove_role(user_id: int, role_name: Role) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def remove_role(user_id: int, role_name: Role) -> None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     DELETE FROM users_role
                     WHERE users_role.user_id = %s
@@ -96,15 +92,36 @@ def remove_role(user_id: int, role_name: Role) -> None:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            conn.commit()
-            conn.close()
 
 
-def get_roles(user_id: int) -> set[Role]:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def get_all_roles() -> dict[int, set[Role]]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
+                    """
+                    SELECT users_role.user_id, role.name
+                    FROM users_role JOIN role ON role.id = users_role.role_id;
+                """
+                )
+            except psycopg.Error as err:
+                logging.log(logging.ERROR, err)
+            roles: dict[int, set[Role]] = {}
+            for record in await cur.fetchall():
+                value: str = record[1]
+                try:
+                    value = record[1].decode("utf-8")
+                except AttributeError:
+                    pass
+                roles.setdefault(int(record[0]), set()).add(value)
+            return roles
+
+
+async def get_roles(user_id: int) -> set[Role]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                await cur.execute(
                     """
                     SELECT role.name
                     FROM (users JOIN users_role ON users.id = users_role.user_id)
@@ -116,12 +133,11 @@ def get_roles(user_id: int) -> set[Role]:
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
             roles = set()
-            for record in cur.fetchall():
+            for record in await cur.fetchall():
                 value: str = record[0]
                 try:
                     value = record[0].decode("utf-8")
                 except AttributeError:
                     pass
                 roles.add(value)
-            conn.close()
             return roles
@@ -5,7 +5,7 @@ import psycopg
 
 from app.constants import Dates
 
-from .base import get_connection
+from .base import get_async_connection, get_connection
 from .models import User
 
 
@@ -24,11 +24,9 @@ def create_user_table() -> None:
                 );
                 """
             )
-            conn.commit()
-            conn.close()
 
 
-def insert_user(
+async def insert_user(
     id: int,
     username: str | None = None,
     first_name: str | None = None,
@@ -40,10 +38,10 @@ def insert_user(
         last_buy_post = Dates.MARKET_EPOCH
     if last_sell_post is None:
         last_sell_post = Dates.MARKET_EPOCH
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                 INSERT INTO users(
                     id,
@@ -65,15 +63,13 @@ def insert_user(
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            conn.commit()
-            conn.close()
 
 
-def get_user_from_id(id: int) -> User | None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def get_user_from_id(id: int) -> User | None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT id, username, first_name, last_name, last_buy_post, last_sell_post
                     FROM users
@@ -83,16 +79,15 @@ def get_user_from_id(id: int) -> User | None:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            record = cur.fetchone()
-            conn.close()
+            record = await cur.fetchone()
             return User(record) if record else None
 
 
-def get_user_from_username(username: str) -> User | None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def get_user_from_username(username: str) -> User | None:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT id, username, first_name, last_name, last_buy_post, last_sell_post
                     FROM users
@@ -102,16 +97,15 @@ def get_user_from_username(username: str) -> User | None:
                 )
             except psycopg.Error as err:
                 logging.log(logging.ERROR, err)
-            record = cur.fetchone()
-            conn.close()
+            record = await cur.fetchone()
             return User(record) if record else None
 
 
-def get_all_users() -> list[User]:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+async def get_all_users() -> list[User]:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT id, username, first_name, last_name, last_buy_post, last_sell_post
                     FROM users;
@@ -119,18 +113,17 @@ def get_all_users() -> list[User]:
                 )
             except psycopg.Error as err:
                 print(err)
-            users = [User(record) for record in cur.fetchall()]
-            conn.close()
+            users = [User(record) for record in await cur.fetchall()]
             return users
 
 
-def update_user_info(
+async def update_user_info(
     id: int, username: str | None, first_name: str | None, last_name: str | None
 ) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     UPDATE users
                     SET username=%s, first_name=%s, last_name=%s
@@ -140,18 +133,73 @@ def update_user_info(
                 )
             except psycopg.Error as err:
                 print(err)
-            conn.commit()
-            conn.close()
 
 
-def update_user_last_buy_post(
+async def update_users_info(
+    users_info: list[tuple[int, str | None, str | None, str | None]]
+) -> bool:
+    # Connection errors are caught too, the caller keeps the rows on failure
+    try:
+        async with get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    UPDATE users
+                    SET username=updates.username,
+                        first_name=updates.first_name,
+                        last_name=updates.last_name
+                    FROM UNNEST(%s::NUMERIC[], %s::VARCHAR[], %s::TEXT[], %s::TEXT[])
+                        AS updates(id, username, first_name, last_name)
+                    WHERE users.id=updates.id;
+                """,
+                    (
+                        [user_info[0] for user_info in users_info],
+                        [user_info[1] for user_info in users_info],
+                        [user_info[2] for user_info in users_info],
+                        [user_info[3] for user_info in users_info],
+                    ),
+                )
+    except psycopg.Error as err:
+        logging.log(logging.ERROR, err)
+        return False
+    return True
+
+
+async def update_users_post_dates(
+    post_dates: list[tuple[int, datetime | None, datetime | None]]
+) -> bool:
+    try:
+        async with get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    UPDATE users
+                    SET last_buy_post=COALESCE(updates.last_buy_post, users.last_buy_post),
+                        last_sell_post=COALESCE(updates.last_sell_post, users.last_sell_post)
+                    FROM UNNEST(%s::NUMERIC[], %s::TIMESTAMP[], %s::TIMESTAMP[])
+                        AS updates(id, last_buy_post, last_sell_post)
+                    WHERE users.id=updates.id;
+                """,
+                    (
+                        [post_date[0] for post_date in post_dates],
+                        [post_date[1] for post_date in post_dates],
+                        [post_date[2] for post_date in post_dates],
+                    ),
+                )
+    except psycopg.Error as err:
+        logging.log(logging.ERROR, err)
+        return False
+    return True
+
+
+async def update_user_last_buy_post(
     id: int,
     last_buy_post: datetime,
 ) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     UPDATE users
                     SET last_buy_post=%s
@@ -161,18 +209,16 @@ def update_user_last_buy_post(
                 )
             except psycopg.Error as err:
                 print(err)
-            conn.commit()
-            conn.close()
 
 
-def update_user_last_sell_post(
+async def update_user_last_sell_post(
     id: int,
     last_sell_post: datetime,
 ) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cur:
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     UPDATE users
                     SET last_sell_post=%s
@@ -182,5 +228,3 @@ def update_user_last_sell_post(
                 )
             except psycopg.Error as err:
                 print(err)
-            conn.commit()
-            conn.close()
@@ -4,7 +4,8 @@ from telegram.ext.filters import MessageFilter
 from app.cache import has_role
 from app.config import approval_id, debug_user_id, main_id, market_id
 from app.constants import Roles
-from app.message_helpers import is_feedback_post
+from app.game_engine import active_games
+from app.message_helpers import get_post_type
 
 
 class AdminFilter(MessageFilter):
@@ -37,6 +38,11 @@ class DebugUserFilter(MessageFilter):
         return True if message.from_user.id == debug_user_id() else False
 
 
+class ActiveGameFilter(MessageFilter):
+    def filter(self, message: Message) -> bool:
+        return message.chat.id in active_games
+
+
 class MediaGroupFilter(MessageFilter):
     def filter(self, message: Message) -> bool:
         return True if message.media_group_id is not None else False
@@ -51,4 +57,4 @@ class FeedbackFilter(MessageFilter):
             return False
         if text is None:
             return False
-        return is_feedback_post(text=text)
+        return get_post_type(text) == "feedback"
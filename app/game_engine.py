@@ -0,0 +1,256 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum, auto
+
+from telegram.ext import Application, CallbackContext, ContextTypes
+
+from app import database as db
+from app.cache import insert_guess_game_scores
+from app.constants import GuessGame
+from app.message_helpers import (get_rankings_message_from_scores,
+                                 messages_cleaner_job)
+
+
+class GameState(Enum):
+    WAITING = auto()
+    GUESSING = auto()
+    ROUND_WON = auto()
+    FINISHED = auto()
+
+
+class Game(ABC):
+    game_type: str
+    hint_count: int
+    game_length = GuessGame.GAME_LENGTH
+    first_round_delay: float = GuessGame.FIRST_ROUND_DELAY
+    round_delay: float = GuessGame.ROUND_DELAY
+    hint_interval: float = GuessGame.HINT_INTERVAL
+
+    def __init__(self, chat_id: int) -> None:
+        self.chat_id = chat_id
+        self.start_time = datetime.now()
+        self.users_scores: dict[int, int] = {}
+        self.rounds_won = 0
+        self.hint = 0
+        self.state = GameState.WAITING
+        self.messages_to_delete: list[tuple[int, int]] = []
+        self.round_won = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.suspended = False
+
+    @property
+    @abstractmethod
+    def answer_name(self) -> str: ...
+
+    @abstractmethod
+    async def start(self, context: ContextTypes.DEFAULT_TYPE) -> None: ...
+
+    @abstractmethod
+    async def next_round(self, context: ContextTypes.DEFAULT_TYPE) -> bool: ...
+
+    @abstractmethod
+    async def send_hint(self, context: ContextTypes.DEFAULT_TYPE) -> None: ...
+
+    @abstractmethod
+    async def reveal(self, context: ContextTypes.DEFAULT_TYPE) -> None: ...
+
+    @abstractmethod
+    def is_correct(self, guess: str) -> bool: ...
+
+    @abstractmethod
+    def get_score(self) -> int: ...
+
+    async def prepare(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+    def get_data(self) -> dict:
+        return {}
+
+    def set_data(self, data: dict) -> None:
+        return None
+
+    def win_round(self, user_id: int) -> int:
+        self.state = GameState.ROUND_WON
+        # Set before the winner is announced, so no hint or reveal can follow
+        self.round_won.set()
+        score = self.get_score()
+        self.users_scores[user_id] = self.users_scores.get(user_id, 0) + score
+        self.rounds_won += 1
+        return score
+
+
+active_games: dict[int, Game] = {}
+game_types: dict[str, type[Game]] = {}
+
+
+def register_game[G: Game](game_class: type[G]) -> type[G]:
+    game_types[game_class.game_type] = game_class
+    return game_class
+
+
+def get_active_game(chat_id: int) -> Game | None:
+    return active_games.get(chat_id)
+
+
+def start_game(
+    game: Game, context: ContextTypes.DEFAULT_TYPE, resumed: bool = False
+) -> bool:
+    if game.chat_id in active_games:
+        return False
+    active_games[game.chat_id] = game
+    # Not an application task, those are awaited when the bot stops
+    game.task = asyncio.create_task(run_game(game, context, resumed))
+    return True
+
+
+def stop_game(chat_id: int) -> bool:
+    game = active_games.get(chat_id)
+    if game is None or game.task is None:
+        return False
+    game.task.cancel()
+    return True
+
+
+async def save_game(game: Game) -> None:
+    await db.save_game_state(
+        chat_id=game.chat_id,
+        game_type=game.game_type,
+        start_time=game.start_time,
+        data={
+            "users_scores": {
+                str(user_id): score for user_id, score in game.users_scores.items()
+            },
+            "rounds_won": game.rounds_won,
+            "messages_to_delete": game.messages_to_delete,
+            **game.get_data(),
+        },
+    )
+
+
+async def load_saved_games() -> list[Game]:
+    games: list[Game] = []
+    for saved_game in await db.get_saved_games():
+        game_class = game_types.get(saved_game.game_type)
+        if game_class is None:
+            await db.delete_game_state(saved_game.chat_id)
+            continue
+        game = game_class(saved_game.chat_id)
+        game.start_time = saved_game.start_time
+        game.users_scores = {
+            int(user_id): score
+            for user_id, score in saved_game.data["users_scores"].items()
+        }
+        game.rounds_won = saved_game.data["rounds_won"]
+        game.messages_to_delete = [
+            (chat_id, message_id)
+            for chat_id, message_id in saved_game.data["messages_to_delete"]
+        ]
+        game.set_data(saved_game.data)
+        games.append(game)
+    return games
+
+
+async def resume_games(application: Application) -> None:
+    context: ContextTypes.DEFAULT_TYPE = CallbackContext(application)
+    for game in await load_saved_games():
+        start_game(game, context, resumed=True)
+
+
+async def suspend_games() -> None:
+    # Saved games stay in the database and are resumed on the next start
+    tasks: list[asyncio.Task] = []
+    for game in active_games.values():
+        if game.task is not None:
+            game.suspended = True
+            game.task.cancel()
+            tasks.append(game.task)
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def wait_for_win(game: Game, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(game.round_won.wait(), timeout)
+        return True
+    except TimeoutError:
+        return False
+
+
+async def play_round(game: Game, context: ContextTypes.DEFAULT_TYPE) -> None:
+    game.round_won.clear()
+    game.state = GameState.GUESSING
+    for hint in range(game.hint_count):
+        if game.state == GameState.ROUND_WON:
+            return
+        game.hint = hint
+        await game.send_hint(context)
+        if await wait_for_win(game, game.hint_interval):
+            return
+
+    if game.state == GameState.ROUND_WON:
+        return
+    game.state = GameState.WAITING
+    await game.reveal(context)
+
+
+async def finish_game(game: Game, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await insert_guess_game_scores(
+        game_time=game.start_time,
+        scores=game.users_scores,
+    )
+    rankings = await get_rankings_message_from_scores(game.users_scores)
+    await context.bot.send_message(
+        chat_id=game.chat_id,
+        text=f"Il gioco è terminato! Classifica finale:\n{rankings}",
+    )
+
+
+async def run_game(
+    game: Game, context: ContextTypes.DEFAULT_TYPE, resumed: bool = False
+) -> None:
+    try:
+        await game.prepare(context)
+        if resumed:
+            await context.bot.send_message(
+                chat_id=game.chat_id, text="Il gioco riprende da dove era rimasto!"
+            )
+        else:
+            await game.start(context)
+        await save_game(game)
+        await asyncio.sleep(game.first_round_delay)
+        while game.rounds_won < game.game_length and await game.next_round(context):
+            await play_round(game, context)
+            # Only round boundaries are persisted, never single guesses
+            await save_game(game)
+            if game.rounds_won >= game.game_length:
+                break
+            game.state = GameState.WAITING
+            await asyncio.sleep(game.round_delay)
+
+        game.state = GameState.FINISHED
+        await finish_game(game, context)
+    except Exception as err:
+        logging.log(logging.ERROR, f"Game in chat {game.chat_id} failed: {err!r}")
+    finally:
+        game.state = GameState.FINISHED
+        game.close()
+        active_games.pop(game.chat_id, None)
+        if not game.suspended:
+            await end_game(game, context)
+
+
+async def end_game(game: Game, context: ContextTypes.DEFAULT_TYPE) -> None:
+    try:
+        await db.delete_game_state(game.chat_id)
+    finally:
+        context.job_queue.run_repeating(
+            callback=messages_cleaner_job,
+            interval=5,
+            first=1,
+            data=game.messages_to_delete,
+            name=str(game.chat_id) + "cleaner",
+        )
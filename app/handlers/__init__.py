@@ -1,14 +1,29 @@
 from . import admin_commands, chats, conversations, user_commands
+from .routing import ALL_CHATS, ChatCategory, route_handlers
 
-handlers = {
+handler_groups = {
     0: chats.service_handlers(),
     1: admin_commands.role_handlers()
     + admin_commands.helpers_handlers()
     + admin_commands.market_handlers(),
-    2: user_commands.info_handlers() + user_commands.market_handlers(),
+    2: user_commands.info_handlers()
+    + user_commands.inline_search_handlers()
+    + user_commands.market_handlers(),
     3: chats.market_handlers(),
     4: conversations.seller_auth_handlers(),
     5: admin_commands.market_plus_handlers(),
-    6: conversations.guess_game_conv_handler(),
-    7: conversations.emoji_game_conv_handler(),
+    6: conversations.guess_game_handlers() + conversations.emoji_game_handlers(),
+    7: conversations.game_handlers(),
 }
+
+# Chats where each group can match, groups that are missing are checked for all
+handler_routes: dict[int, frozenset[ChatCategory]] = {
+    1: ALL_CHATS - {"none"},
+    3: frozenset(("market",)),
+    4: frozenset(("private", "approval")),
+    5: frozenset(("private",)),
+    6: frozenset(("main", "approval", "group")),
+    7: frozenset(("main", "approval", "group")),
+}
+
+handlers = route_handlers(handler_groups, handler_routes)
@@ -27,7 +27,7 @@ async def user_info_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if len(context.args) == 0:
         return
 
-    if user := get_user_from_command_arg(arg=context.args[0]):
+    if user := await get_user_from_command_arg(arg=context.args[0]):
         await update.message.reply_text(
             f"Utente: {user.first_name} {user.last_name}.\nUsername: @{user.username}\nId: {user.id}",
             reply_markup=ReplyKeyboardRemove(),
@@ -64,7 +64,7 @@ async def send_private_message_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -103,7 +103,7 @@ async def announce_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         reply_markup=ReplyKeyboardRemove(),
     )
 
-    id_list: list[int] = [user.id for user in get_all_users()]
+    id_list: list[int] = [user.id for user in await get_all_users()]
     context.job_queue.run_repeating(
         callback=send_announce_job,
         interval=10,
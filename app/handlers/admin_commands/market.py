@@ -19,7 +19,7 @@ async def reset_date_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -32,7 +32,7 @@ async def reset_date_handler(
         )
         return
 
-    update_user_date(
+    await update_user_date(
         id=user.id, last_buy_post=Dates.MARKET_EPOCH, last_sell_post=Dates.MARKET_EPOCH
     )
     await update.message.reply_text(
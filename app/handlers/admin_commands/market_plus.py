@@ -48,7 +48,7 @@ async def market_plus_handler(
         chat_id=market_plus_id()
     )
     end_date = datetime.now() + timedelta(hours=int(context.args[0]))
-    insert_market_plus_post(message_id=forwarded_message.id, end_date=end_date)
+    await insert_market_plus_post(message_id=forwarded_message.id, end_date=end_date)
     await context.bot.send_message(
         update.message.from_user.id,
         "Messaggio market plus inviato correttamente!",
@@ -65,7 +65,7 @@ async def market_plus_job(context: ContextTypes.DEFAULT_TYPE) -> None:
             first=25200,
         )
 
-    posts: list[MarketPlusPost] = get_posts_to_send()
+    posts: list[MarketPlusPost] = await get_posts_to_send()
     if len(posts) == 0:
         return
     # trunk-ignore(bandit/B311)
@@ -82,9 +82,11 @@ async def market_plus_job(context: ContextTypes.DEFAULT_TYPE) -> None:
     await context.bot.pin_chat_message(
         market_id(), message_id=forwarded_post.id, disable_notification=False
     )
-    update_posted_date(message_id=post_to_send.message_id, market_id=forwarded_post.id)
+    await update_posted_date(
+        message_id=post_to_send.message_id, market_id=forwarded_post.id
+    )
 
-    posts_to_delete: list[MarketPlusPost] = get_posts_to_delete()
+    posts_to_delete: list[MarketPlusPost] = await get_posts_to_delete()
     for post in posts_to_delete:
         if post.message_id:
             await context.bot.delete_message(
@@ -94,4 +96,4 @@ async def market_plus_job(context: ContextTypes.DEFAULT_TYPE) -> None:
             await context.bot.delete_message(
                 chat_id=market_id(), message_id=post.last_posted_market_id
             )
-        update_delete_market_plus_post(post.message_id)
+        await update_delete_market_plus_post(post.message_id)
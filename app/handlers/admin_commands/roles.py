@@ -1,7 +1,7 @@
 from telegram import ReplyKeyboardRemove, Update
 from telegram.ext import CommandHandler, ContextTypes
 
-from app.cache import has_role, insert_role, remove_role
+from app.cache import has_role, insert_role, load_role_index, remove_role
 from app.constants import Messages, Roles
 from app.filters import AdminFilter, ApprovalGroupFilter, DebugUserFilter
 from app.message_helpers import get_user_from_command_arg
@@ -25,6 +25,9 @@ def role_handlers() -> list[CommandHandler]:
         CommandHandler(
             "removemod", remove_moderator_handler, DebugUserFilter() | AdminFilter()
         ),
+        CommandHandler(
+            "reloadroles", reload_roles_handler, DebugUserFilter() | AdminFilter()
+        ),
     ]
 
 
@@ -34,7 +37,7 @@ async def make_seller_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -46,7 +49,7 @@ async def make_seller_handler(
         )
         return
 
-    insert_role(id=user.id, role_name=Roles.SELLER)
+    await insert_role(id=user.id, role_name=Roles.SELLER)
     await update.message.reply_text(
         "Utente approvato come venditore!", reply_markup=ReplyKeyboardRemove()
     )
@@ -63,7 +66,7 @@ async def remove_seller_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -75,7 +78,7 @@ async def remove_seller_handler(
         )
         return
 
-    remove_role(id=user.id, role_name=Roles.SELLER)
+    await remove_role(id=user.id, role_name=Roles.SELLER)
     await update.message.reply_text(
         "L'utente non è più un venditore!", reply_markup=ReplyKeyboardRemove()
     )
@@ -92,7 +95,7 @@ async def make_scammer_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -104,7 +107,7 @@ async def make_scammer_handler(
         )
         return
 
-    insert_role(id=user.id, role_name=Roles.SCAMMER)
+    await insert_role(id=user.id, role_name=Roles.SCAMMER)
     await update.message.reply_text(
         "Utente inserito nella lista scammer!", reply_markup=ReplyKeyboardRemove()
     )
@@ -116,7 +119,7 @@ async def remove_scammer_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -128,7 +131,7 @@ async def remove_scammer_handler(
         )
         return
 
-    remove_role(id=user.id, role_name=Roles.SCAMMER)
+    await remove_role(id=user.id, role_name=Roles.SCAMMER)
     await update.message.reply_text(
         "L'utente non è più nella lista scammer!", reply_markup=ReplyKeyboardRemove()
     )
@@ -145,7 +148,7 @@ async def make_admin_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -157,7 +160,7 @@ async def make_admin_handler(
         )
         return
 
-    insert_role(id=user.id, role_name=Roles.ADMIN)
+    await insert_role(id=user.id, role_name=Roles.ADMIN)
     await update.message.reply_text(
         "Utente aggiunto come admin!", reply_markup=ReplyKeyboardRemove()
     )
@@ -169,7 +172,7 @@ async def remove_admin_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -181,7 +184,7 @@ async def remove_admin_handler(
         )
         return
 
-    remove_role(id=user.id, role_name=Roles.ADMIN)
+    await remove_role(id=user.id, role_name=Roles.ADMIN)
     await update.message.reply_text(
         "L'utente non è più admin!", reply_markup=ReplyKeyboardRemove()
     )
@@ -193,7 +196,7 @@ async def make_moderator_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -205,7 +208,7 @@ async def make_moderator_handler(
         )
         return
 
-    insert_role(id=user.id, role_name=Roles.MODERATOR)
+    await insert_role(id=user.id, role_name=Roles.MODERATOR)
     await update.message.reply_text(
         "Utente aggiunto come moderatore!", reply_markup=ReplyKeyboardRemove()
     )
@@ -217,7 +220,7 @@ async def remove_moderator_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -229,7 +232,16 @@ async def remove_moderator_handler(
         )
         return
 
-    remove_role(id=user.id, role_name=Roles.MODERATOR)
+    await remove_role(id=user.id, role_name=Roles.MODERATOR)
     await update.message.reply_text(
         "L'utente non è più moderatore!", reply_markup=ReplyKeyboardRemove()
     )
+
+
+async def reload_roles_handler(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    await load_role_index()
+    await update.message.reply_text(
+        "Ruoli ricaricati!", reply_markup=ReplyKeyboardRemove()
+    )
@@ -7,13 +7,14 @@ from telegram import (InputMediaDocument, InputMediaPhoto, InputMediaVideo,
 from telegram.ext import ContextTypes, MessageHandler, filters
 from telegram.helpers import effective_message_type
 
-from app.cache import get_user, has_role, insert_feedback, update_user_date
+from app.cache import consume_post_quota, get_user, has_role, insert_feedback
 from app.config import feedback_channel_id
+from app.constants import MediaGroups
 from app.filters import (AdminFilter, DebugUserFilter, FeedbackFilter,
                          MarketGroupFilter, MediaGroupFilter)
-from app.message_helpers import (get_user_from_text, has_sent_buy_post_today,
-                                 has_sent_sell_post_today, is_buy_post,
-                                 is_sell_post)
+from app.message_helpers import get_market_post_type, get_user_from_text
+
+from .media_group_buffer import MediaGroupBuffer
 
 
 def market_handlers() -> list:
@@ -77,23 +78,14 @@ async def market_media_group_handler(
         caption=message.caption_html,
         media_msg=update.message,
     )
-    jobs = context.job_queue.get_jobs_by_name(str(message.media_group_id))
-    if jobs:
-        jobs[0].data.append(media_data)
-    else:
-        context.job_queue.run_once(
-            callback=media_group_job,
-            when=1,
-            data=[media_data],
-            name=str(message.media_group_id),
-        )
+    media_group_buffer.append(message.media_group_id, media_data)
 
 
-async def media_group_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+async def media_group_flush(data: list[MediaGroupMediaData]) -> None:
+    bot = data[-1].media_msg.get_bot()
     media_group: list = []
-    data: list[MediaGroupMediaData] = context.job.data
     post_type: Literal["buy", "sell", "invalid"] = "invalid"
-    user = get_user(id=data[-1].media_msg.from_user.id)
+    user = await get_user(id=data[-1].media_msg.from_user.id)
     if user is None:
         for media in data:
             await media.media_msg.delete()
@@ -103,12 +95,13 @@ async def media_group_job(context: ContextTypes.DEFAULT_TYPE) -> None:
         if media.caption is not None:
             if "@asteygoitamarketing" in media.caption.lower():
                 return
-            if is_buy_post(media.caption):
-                post_type = "buy"
-            elif is_sell_post(media.caption) and has_role(user.id, "seller"):
-                post_type = "sell"
-            else:
-                post_type = "invalid"
+            match get_market_post_type(media.caption, album=True):
+                case "buy":
+                    post_type = "buy"
+                case "sell" if has_role(user.id, "seller"):
+                    post_type = "sell"
+                case _:
+                    post_type = "invalid"
 
         media_group.append(
             MEDIA_GROUP_TYPES[media.media_type](
@@ -117,29 +110,33 @@ async def media_group_job(context: ContextTypes.DEFAULT_TYPE) -> None:
         )
 
     if post_type == "sell":
-        if has_sent_sell_post_today(user):
+        if not consume_post_quota(user, "sell"):
             post_type = "invalid"
-            await context.bot.send_message(
+            await bot.send_message(
                 user.id,
                 "Il tuo messaggio è stato eliminato, hai già inviato un post di vendo oggi!",
             )
-        else:
-            update_user_date(id=user.id, last_sell_post=datetime.now())
     elif post_type == "buy":
-        if has_sent_buy_post_today(user):
+        if not consume_post_quota(user, "buy"):
             post_type = "invalid"
-            await context.bot.send_message(
+            await bot.send_message(
                 user.id,
                 "Il tuo messaggio è stato eliminato, hai già inviato un post di cerco oggi!",
             )
-        else:
-            update_user_date(id=user.id, last_buy_post=datetime.now())
 
     if post_type == "invalid":
         for media in data:
             await media.media_msg.delete()
 
 
+media_group_buffer = MediaGroupBuffer(
+    flush=media_group_flush,
+    quiet_period=MediaGroups.QUIET_PERIOD,
+    max_delay=MediaGroups.MAX_DELAY,
+    tick_length=MediaGroups.TICK_LENGTH,
+)
+
+
 async def market_post_handler(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
@@ -162,33 +159,30 @@ async def market_post_handler(
     ):
         return
 
-    user = get_user(id=update.message.from_user.id)
+    user = await get_user(id=update.message.from_user.id)
     if user is None:
         await update.message.delete()
         return
+    post_type = get_market_post_type(msg)
     if (
-        is_sell_post(msg)
+        post_type == "sell"
         and (update.message.photo or update.message.video or update.message.video_note)
         and has_role(update.message.from_user.id, "seller")
     ):
-        if has_sent_sell_post_today(user):
+        if not consume_post_quota(user, "sell"):
             await context.bot.send_message(
                 user.id,
                 "Il tuo messaggio è stato eliminato, hai già inviato un post di vendo oggi!",
             )
             await update.message.delete()
-        else:
-            update_user_date(id=user.id, last_sell_post=datetime.now())
 
-    elif is_buy_post(msg) and not is_sell_post(msg):
-        if has_sent_buy_post_today(user):
+    elif post_type == "buy":
+        if not consume_post_quota(user, "buy"):
             await context.bot.send_message(
                 user.id,
                 "Il tuo messaggio è stato eliminato, hai già inviato un post di cerco oggi!",
             )
             await update.message.delete()
-        else:
-            update_user_date(id=user.id, last_buy_post=datetime.now())
     else:
         await update.message.delete()
 
@@ -196,12 +190,12 @@ async def market_post_handler(
 async def feedback_msg_handler(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
-    user = get_user(id=update.message.from_user.id)
+    user = await get_user(id=update.message.from_user.id)
     if user is None:
         await update.message.delete()
         return
     msg = update.message.text
-    seller = get_user_from_text(msg)
+    seller = await get_user_from_text(msg)
     if seller is None:
         await context.bot.send_message(
             user.id,
@@ -225,7 +219,7 @@ async def feedback_msg_handler(
         await update.message.delete()
         return
 
-    insert_feedback(
+    await insert_feedback(
         seller_id=seller.id, buyer_id=user.id, contents=msg, date=datetime.now()
     )
     await context.bot.forward_message(
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+
+@dataclass
+class BufferedMediaGroup[T]:
+    items: list[T]
+    first_seen: float
+    tick: int = 0
+
+
+@dataclass
+class MediaGroupBuffer[T]:
+    flush: Callable[[list[T]], Awaitable[None]]
+    quiet_period: float
+    max_delay: float
+    tick_length: float
+    groups: dict[str, BufferedMediaGroup[T]] = field(default_factory=dict)
+    wheel: dict[int, set[str]] = field(default_factory=dict)
+    task: asyncio.Task | None = None
+    flush_tasks: set[asyncio.Task] = field(default_factory=set)
+
+    def get_tick(self, timestamp: float) -> int:
+        return math.ceil(timestamp / self.tick_length)
+
+    def append(self, media_group_id: str, item: T) -> None:
+        now = time.monotonic()
+        group = self.groups.get(media_group_id)
+        if group is None:
+            group = BufferedMediaGroup(items=[], first_seen=now)
+            self.groups[media_group_id] = group
+        else:
+            self.wheel[group.tick].discard(media_group_id)
+        group.items.append(item)
+
+        # Every new item extends the quiet period, up to max_delay from the first
+        deadline = min(now + self.quiet_period, group.first_seen + self.max_delay)
+        group.tick = self.get_tick(deadline)
+        self.wheel.setdefault(group.tick, set()).add(media_group_id)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        current_tick = self.get_tick(time.monotonic())
+        while len(self.groups) > 0:
+            await asyncio.sleep(
+                max(0, current_tick * self.tick_length - time.monotonic())
+            )
+            for media_group_id in self.wheel.pop(current_tick, set()):
+                group = self.groups.pop(media_group_id)
+                flush_task = asyncio.create_task(self.run_flush(group.items))
+                self.flush_tasks.add(flush_task)
+                flush_task.add_done_callback(self.flush_tasks.discard)
+            current_tick += 1
+
+    async def run_flush(self, items: list[T]) -> None:
+        try:
+            await self.flush(items)
+        except Exception as err:
+            logging.log(logging.ERROR, f"Could not handle a media group: {err!r}")
@@ -1,4 +1,5 @@
 # trunk-ignore-all(ruff)
-from .emoji_game import emoji_game_conv_handler
-from .guess_game import guess_game_conv_handler
+from .emoji_game import emoji_game_handlers
+from .game_commands import game_handlers
+from .guess_game import guess_game_handlers
 from .seller_auth import seller_auth_handlers
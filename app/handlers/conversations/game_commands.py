@@ -0,0 +1,61 @@
+from telegram import ReactionTypeEmoji, Update
+from telegram.constants import ReactionEmoji
+from telegram.ext import (BaseHandler, CommandHandler, ContextTypes,
+                          MessageHandler, filters)
+
+from app.filters import ActiveGameFilter, ModeratorFilter
+from app.game_engine import GameState, get_active_game, stop_game
+
+
+def game_handlers() -> list[BaseHandler]:
+    return [
+        MessageHandler(
+            ActiveGameFilter()
+            & ~filters.COMMAND
+            & filters.TEXT
+            & filters.ChatType.GROUPS,
+            guess_handler,
+        ),
+        CommandHandler(
+            "stopgame",
+            stop_game_handler,
+            ActiveGameFilter() & filters.ChatType.GROUPS & ModeratorFilter(),
+        ),
+    ]
+
+
+async def guess_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if (
+        update.message is None
+        or update.message.reply_to_message is None
+        or update.message.reply_to_message.from_user.id != context.bot.id
+    ):
+        return
+
+    guess_word = update.message.text
+    if len(guess_word) > 50:
+        return
+
+    game = get_active_game(update.message.chat.id)
+    if game is None:
+        return
+    game.messages_to_delete.append((update.message.chat_id, update.message.message_id))
+
+    if game.state != GameState.GUESSING or not game.is_correct(guess_word):
+        await update.message.set_reaction(
+            reaction=ReactionTypeEmoji(ReactionEmoji.THUMBS_DOWN)
+        )
+        return
+
+    # The round is claimed before any await so a second correct guess is rejected
+    score_gained = game.win_round(update.message.from_user.id)
+    score_text_display = "punti" if score_gained > 1 else "punto"
+    await update.message.set_reaction(reaction=ReactionTypeEmoji(ReactionEmoji.FIRE))
+    await update.message.reply_text(
+        text=f'"{game.answer_name}" è corretto! Ti sei aggiudicato {score_gained} {score_text_display}!'
+    )
+
+
+async def stop_game_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if stop_game(update.message.chat.id):
+        await update.message.reply_text(text="Gioco terminato!")
@@ -1,300 +1,171 @@
 import asyncio
-import json
 import logging
-import os
-import random
 from dataclasses import dataclass
-from datetime import datetime
-from difflib import SequenceMatcher
 
-import requests
-from telegram import Message, ReactionTypeEmoji, Update
-from telegram.constants import ReactionEmoji
-from telegram.error import BadRequest, Forbidden, TimedOut
-from telegram.ext import (
-    CommandHandler,
-    ContextTypes,
-    ConversationHandler,
-    MessageHandler,
-    filters,
-)
+from telegram import Update
+from telegram.ext import CommandHandler, ContextTypes, filters
 
-from app.api import CardData, get_cropped_image, get_image_bytes
-from app.cache import get_card_data, insert_guess_game_scores
+from app.api import (
+    CardData,
+    get_random_card_name,
+    load_card_names,
+    render_card_frames,
+)
+from app.cache import get_card_data
 from app.constants import GuessGame
 from app.filters import MarketGroupFilter, ModeratorFilter
+from app.game_engine import Game, register_game, start_game
 from app.message_helpers import (
-    get_rankings_message_from_scores,
+    is_close_match,
     remove_non_alpha_characters,
+    send_card_photo,
 )
 
 
 @dataclass
-class GameStateData:
-    start_time: datetime
-    chat_id: int
-    users_scores: dict[int, int]
-    guessed_cards: list[str]
-    messages_to_delete: list[Message]
-    card_to_guess_name: str
-    card_to_guess_data: CardData | None
-    crop_level: int
-
-
-GUESSING = range(1)
-
-
-def guess_game_conv_handler() -> list[ConversationHandler]:
-    return [
-        ConversationHandler(
-            entry_points=[
-                CommandHandler(
-                    "guessthecard",
-                    guess_the_card_handler,
-                    filters.ChatType.GROUPS & ~MarketGroupFilter() & ModeratorFilter(),
-                )
-            ],
-            states={
-                GUESSING: [
-                    MessageHandler(
-                        ~filters.COMMAND & filters.TEXT & filters.ChatType.GROUPS,
-                        guess_handler,
-                    )
-                ],
-            },
-            fallbacks=[
-                CommandHandler(
-                    "stopgame",
-                    stop_game_handler,
-                    filters.ChatType.GROUPS & ModeratorFilter(),
-                ),
-            ],
-            per_chat=True,
-            per_user=False,
+class GuessRound:
+    card_data: CardData
+    frames: tuple[bytes, ...]
+
+
+@register_game
+class GuessTheCardGame(Game):
+    game_type = "guess_the_card"
+    hint_count = 5
+
+    def __init__(self, chat_id: int) -> None:
+        super().__init__(chat_id)
+        self.used_card_names: set[str] = set()
+        self.card_to_guess_name = ""
+        self.card_to_guess_answer = ""
+        self.frames: tuple[bytes, ...] = ()
+        self.next_rounds: asyncio.Queue[GuessRound] = asyncio.Queue(
+            maxsize=GuessGame.PREFETCH_ROUNDS
         )
-    ]
-
-
-async def guess_the_card_handler(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
-) -> object:
-    await load_card_name_db()
-    card_data = await get_card_data("Question")
-    chat_id = update.message.chat.id
-    await context.bot.send_photo(
-        chat_id=chat_id,
-        photo=get_image_bytes(card_data.image),
-        caption="Venghino signori e signore!\nSta per iniziare il Guess The Card, non mancate mi raccomando!",
-    )
-
-    game_state_data = GameStateData(
-        start_time=datetime.now(),
-        chat_id=chat_id,
-        users_scores={},
-        guessed_cards=[],
-        messages_to_delete=[],
-        card_to_guess_name="",
-        card_to_guess_data=None,
-        crop_level=4,
-    )
-    context.job_queue.run_repeating(
-        callback=send_card_job,
-        interval=15,
-        first=15,
-        data=game_state_data,
-        name=str(chat_id),
-    )
-    context.bot_data[chat_id] = game_state_data
-    return GUESSING
-
-
-async def load_card_name_db() -> None:
-    path = "app/static/card_names.json"
-    if not os.path.exists(os.path.abspath(path)):
-        CARD_NAME_URL = "https://db.ygorganization.com/data/idx/card/name/en"
-        response = await asyncio.to_thread(requests.get, url=CARD_NAME_URL, timeout=10)
-        response_json = json.loads(response.content)
-        with open(os.path.abspath(path), "w") as f:
-            json.dump(response_json, f)
-
-
-def get_random_card_name() -> str:
-    path = "app/static/card_names.json"
-    card_database: dict[str, list[int]]
-    with open(os.path.abspath(path), "r") as f:
-        card_database = dict(json.load(f))
-
-    # trunk-ignore(bandit/B311)
-    return random.choice(list(card_database.keys()))
-
-
-async def send_card_job(context: ContextTypes.DEFAULT_TYPE) -> None:
-    data: GameStateData = context.job.data
-    while (
-        data.card_to_guess_data is None
-        or data.card_to_guess_name is None
-        or len(data.card_to_guess_name) == 0
-    ):
-        data.card_to_guess_name = get_random_card_name()
-        data.card_to_guess_data = await get_card_data(data.card_to_guess_name)
-
-    data.card_to_guess_name = data.card_to_guess_data.name
-
-    size = data.card_to_guess_data.image.size
-    crop = data.crop_level if data.crop_level >= 0 else 0
-    image_to_send = get_cropped_image(data.card_to_guess_data.image, crop).resize(size)
-
-    if data.crop_level < 0:
-        message_to_delete = await context.bot.send_photo(
-            data.chat_id,
-            photo=get_image_bytes(image_to_send),
-            caption=f"La carta era {data.card_to_guess_name}, nessuno ha indovinato!",
+        self.prefetch_task: asyncio.Task | None = None
+
+    @property
+    def answer_name(self) -> str:
+        return self.card_to_guess_name
+
+    async def prepare(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await load_card_names()
+        self.start_prefetch()
+
+    async def start(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        card_data = await get_card_data("Question")
+        await send_card_photo(
+            chat_id=self.chat_id,
+            card_data=card_data,
+            context=context,
+            caption="Venghino signori e signore!\nSta per iniziare il Guess The Card, non mancate mi raccomando!",
         )
 
-        data.messages_to_delete.append(message_to_delete)
-        data.card_to_guess_name = ""
-        data.card_to_guess_data = None
-        data.crop_level = 4
-        context.job.schedule_removal()
-        context.job_queue.run_repeating(
-            callback=send_card_job,
-            interval=15,
-            first=10,
-            data=data,
-            name=str(data.chat_id),
+    async def prepare_round(self) -> GuessRound | None:
+        while card_name := get_random_card_name(self.used_card_names):
+            self.used_card_names.add(card_name)
+            card_data = await get_card_data(card_name)
+            if card_data is None:
+                continue
+            frames = await render_card_frames(card_data.image_bytes)
+            return GuessRound(card_data=card_data, frames=frames)
+        return None
+
+    async def prefetch_rounds(self) -> None:
+        # Keeps the next rounds resolved and rendered while the current one runs
+        while guess_round := await self.prepare_round():
+            await self.next_rounds.put(guess_round)
+
+    def start_prefetch(self) -> None:
+        self.prefetch_task = asyncio.create_task(self.prefetch_rounds())
+        self.prefetch_task.add_done_callback(self.prefetch_done)
+
+    def prefetch_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and (err := task.exception()) is not None:
+            logging.log(
+                logging.ERROR, f"Round prefetch in chat {self.chat_id} failed: {err!r}"
+            )
+
+    async def get_next_round(self) -> GuessRound | None:
+        if not self.next_rounds.empty():
+            return self.next_rounds.get_nowait()
+        if self.prefetch_task is None or self.prefetch_task.done():
+            return None
+        # The prefetch can run out of cards or fail while the round is awaited
+        get_round = asyncio.ensure_future(self.next_rounds.get())
+        try:
+            await asyncio.wait(
+                (get_round, self.prefetch_task), return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            if not get_round.done():
+                get_round.cancel()
+        if get_round.done() and not get_round.cancelled():
+            return get_round.result()
+        return None
+
+    async def next_round(self, context: ContextTypes.DEFAULT_TYPE) -> bool:
+        guess_round = await self.get_next_round()
+        if guess_round is None:
+            return False
+        self.card_to_guess_name = guess_round.card_data.name
+        self.card_to_guess_answer = remove_non_alpha_characters(
+            self.card_to_guess_name
+        ).lower()
+        self.frames = guess_round.frames
+        return True
+
+    async def send_hint(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        message = await context.bot.send_photo(
+            self.chat_id,
+            photo=self.frames[self.hint_count - 1 - self.hint],
+            caption="Guess the card!",
         )
-        return
-
-    message_to_delete = await context.bot.send_photo(
-        data.chat_id,
-        photo=get_image_bytes(image_to_send),
-        caption="Guess the card!",
-    )
-    data.crop_level -= 1
-    data.messages_to_delete.append(message_to_delete)
-    context.job.data = data
+        self.messages_to_delete.append((message.chat_id, message.message_id))
 
-
-async def guess_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> object:
-    if (
-        update.message is None
-        or update.message.reply_to_message is None
-        or update.message.reply_to_message.from_user.id != context.bot.id
-    ):
-        return GUESSING
-
-    guess_word = update.message.text
-    if len(guess_word) > 50:
-        return GUESSING
-
-    chat_id = update.message.chat.id
-    jobs = context.job_queue.get_jobs_by_name(str(chat_id))
-    if jobs is None:
-        logging.log(
-            logging.ERROR,
-            "There was an issue during the guess the card game. The send card job was missing.",
+    async def reveal(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        message = await context.bot.send_photo(
+            self.chat_id,
+            photo=self.frames[0],
+            caption=f"La carta era {self.card_to_guess_name}, nessuno ha indovinato!",
         )
-        return GUESSING
-    job = jobs[0]
-    game_state_data: GameStateData = job.data
-    game_state_data.messages_to_delete.append(update.message)
-
-    user_id = update.message.from_user.id
-    guess = remove_non_alpha_characters(guess_word).lower()
-    answer = remove_non_alpha_characters(game_state_data.card_to_guess_name).lower()
-    correctness = SequenceMatcher(None, guess, answer).ratio()
-
-    if correctness < GuessGame.CORRECT_THRESHOLD or len(answer) <= 1:
-        await update.message.set_reaction(
-            reaction=ReactionTypeEmoji(ReactionEmoji.THUMBS_DOWN)
+        self.messages_to_delete.append((message.chat_id, message.message_id))
+
+    def is_correct(self, guess: str) -> bool:
+        answer = self.card_to_guess_answer
+        return len(answer) > 1 and is_close_match(
+            remove_non_alpha_characters(guess).lower(),
+            answer,
+            GuessGame.CORRECT_THRESHOLD,
         )
-        return GUESSING
 
-    game_state_data.guessed_cards.append(game_state_data.card_to_guess_name)
-    score_gained = game_state_data.crop_level + 2
-    current_score: int | None = game_state_data.users_scores.get(user_id)
-    if current_score is None:
-        game_state_data.users_scores[user_id] = score_gained
-    else:
-        game_state_data.users_scores[user_id] += score_gained
-    score_text_display = "punti" if score_gained > 1 else "punto"
-    await update.message.set_reaction(reaction=ReactionTypeEmoji(ReactionEmoji.FIRE))
-    await update.message.reply_text(
-        text=f'"{game_state_data.card_to_guess_name}" è corretto! Ti sei aggiudicato {score_gained} {score_text_display}!'
-    )
+    def get_score(self) -> int:
+        return self.hint_count - self.hint
 
-    if len(game_state_data.guessed_cards) >= GuessGame.GAME_LENGTH:
-        job.schedule_removal()
-        insert_guess_game_scores(
-            game_time=game_state_data.start_time,
-            scores=game_state_data.users_scores,
-        )
-        rankings = get_rankings_message_from_scores(game_state_data.users_scores)
+    def close(self) -> None:
+        if self.prefetch_task is not None:
+            self.prefetch_task.cancel()
+            self.prefetch_task = None
 
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=f"Il gioco è terminato! Classifica finale:\n{rankings}",
-        )
-        context.job_queue.run_repeating(
-            callback=chat_cleaner_job,
-            interval=5,
-            first=1,
-            data=game_state_data,
-            name=str(chat_id) + "cleaner",
-        )
+    def get_data(self) -> dict:
+        return {"used_card_names": sorted(self.used_card_names)}
 
-        return ConversationHandler.END
+    def set_data(self, data: dict) -> None:
+        self.used_card_names = set(data.get("used_card_names", []))
 
-    game_state_data.card_to_guess_name = ""
-    game_state_data.card_to_guess_data = None
-    game_state_data.crop_level = 4
-    job.schedule_removal()
-    context.job_queue.run_repeating(
-        callback=send_card_job,
-        interval=15,
-        first=10,
-        data=game_state_data,
-        name=str(game_state_data.chat_id),
-    )
-    return GUESSING
 
-
-async def chat_cleaner_job(context: ContextTypes.DEFAULT_TYPE) -> None:
-    data: GameStateData = context.job.data
-    for message in list(data.messages_to_delete):
-        timed_out = False
-        try:
-            await message.delete()
-        except TimedOut:
-            timed_out = True
-        except (Forbidden, BadRequest):
-            pass
-        if not timed_out:
-            data.messages_to_delete.remove(message)
-    if len(data.messages_to_delete) <= 0:
-        context.job.schedule_removal()
-    context.job.data = data
+def guess_game_handlers() -> list[CommandHandler]:
+    return [
+        CommandHandler(
+            "guessthecard",
+            guess_the_card_handler,
+            filters.ChatType.GROUPS & ~MarketGroupFilter() & ModeratorFilter(),
+        )
+    ]
 
 
-async def stop_game_handler(
+async def guess_the_card_handler(
     update: Update, context: ContextTypes.DEFAULT_TYPE
-) -> object:
-    chat_id = update.message.chat.id
-    jobs = context.job_queue.get_jobs_by_name(str(chat_id))
-    if jobs is None:
-        logging.log(
-            logging.ERROR,
-            "There was an issue during the guess the card game. The send card job was missing.",
-        )
-        return ConversationHandler.END
-    job = jobs[0]
-    context.job_queue.run_repeating(
-        callback=chat_cleaner_job,
-        interval=5,
-        first=1,
-        data=job.data,
-        name=str(chat_id) + "cleaner",
-    )
-    job.schedule_removal()
-    await update.message.reply_text(text="Gioco terminato!")
-    return ConversationHandler.END
+) -> None:
+    if not start_game(GuessTheCardGame(update.message.chat.id), context):
+        await update.message.reply_text(text="C'è già un gioco in corso!")
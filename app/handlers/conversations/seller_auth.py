@@ -116,7 +116,7 @@ async def reject_seller_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await update.message.reply_text(
             Messages.USER_NOT_FOUND, reply_markup=ReplyKeyboardRemove()
@@ -0,0 +1,73 @@
+from functools import cache
+from typing import Any, Literal
+
+from telegram import Chat, Update
+from telegram.ext import Application, BaseHandler, CallbackContext
+
+from app.config import approval_id, main_id, market_id
+
+type ChatCategory = Literal["market", "main", "approval", "private", "group", "none"]
+
+ALL_CHATS: frozenset[ChatCategory] = frozenset(
+    ("market", "main", "approval", "private", "group", "none")
+)
+
+
+@cache
+def get_group_categories() -> dict[int, ChatCategory]:
+    return {market_id(): "market", main_id(): "main", approval_id(): "approval"}
+
+
+def get_chat_category(update: object) -> ChatCategory:
+    if not isinstance(update, Update) or update.effective_chat is None:
+        return "none"
+    chat = update.effective_chat
+    if chat.type == Chat.PRIVATE:
+        return "private"
+    return get_group_categories().get(chat.id, "group")
+
+
+class RoutedHandlerGroup(BaseHandler[Update, CallbackContext]):
+    def __init__(
+        self, handlers: list[BaseHandler], chats: frozenset[ChatCategory]
+    ) -> None:
+        super().__init__(self.handle_group)
+        self.handlers = handlers
+        self.chats = chats
+
+    def check_update(self, update: object) -> tuple[BaseHandler, object] | None:
+        if get_chat_category(update) not in self.chats:
+            return None
+        # Same as the application does for a group, the first match wins
+        for handler in self.handlers:
+            check = handler.check_update(update)
+            if not (check is None or check is False):
+                return handler, check
+        return None
+
+    async def handle_update(
+        self,
+        update: Update,
+        application: Application,
+        check_result: tuple[BaseHandler, object],
+        context: CallbackContext,
+    ) -> Any:
+        handler, check = check_result
+        return await handler.handle_update(update, application, check, context)
+
+    async def handle_group(self, update: Update, context: CallbackContext) -> None:
+        pass
+
+
+def route_handlers(
+    handlers: dict[int, list[BaseHandler]],
+    routes: dict[int, frozenset[ChatCategory]],
+) -> dict[int, list[BaseHandler]]:
+    routed_handlers: dict[int, list[BaseHandler]] = {}
+    for group, group_handlers in handlers.items():
+        chats = routes.get(group, ALL_CHATS)
+        if chats == ALL_CHATS:
+            routed_handlers[group] = group_handlers
+        else:
+            routed_handlers[group] = [RoutedHandlerGroup(group_handlers, chats)]
+    return routed_handlers
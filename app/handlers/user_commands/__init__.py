@@ -1,3 +1,4 @@
 # trunk-ignore-all(ruff)
 from .info import info_handlers
+from .inline_search import inline_search_handlers
 from .market import market_handlers
@@ -1,19 +1,23 @@
-from telegram import ReplyKeyboardRemove, Update
-from telegram.ext import CommandHandler, ContextTypes, filters
+from telegram import (InlineKeyboardButton, InlineKeyboardMarkup,
+                      ReplyKeyboardRemove, Update)
+from telegram.ext import (BaseHandler, CallbackQueryHandler, CommandHandler,
+                          ContextTypes, filters)
 
-from app.api import get_image_bytes
+from app.api import get_card_info_by_id, suggest_cards
 from app.cache import CardData, get_card_data, get_guess_game_rankings
-from app.constants import Messages
+from app.constants import CardSuggestions, Messages
 from app.filters import MarketGroupFilter
-from app.message_helpers import get_rankings_message_from_scores
+from app.message_helpers import (get_rankings_message_from_scores,
+                                 send_card_photo)
 
 
-def info_handlers() -> list[CommandHandler]:
+def info_handlers() -> list[BaseHandler]:
     return [
         CommandHandler("start", start_handler, filters.ChatType.PRIVATE),
         CommandHandler("gdpr", gdpr_handler, filters.ChatType.PRIVATE),
         CommandHandler("search", card_search_handler, ~MarketGroupFilter()),
         CommandHandler("rankings", guess_game_rankings_handler, ~MarketGroupFilter()),
+        CallbackQueryHandler(card_suggestion_handler, pattern="^search:"),
     ]
 
 
@@ -44,15 +48,62 @@ async def card_search_handler(
         return
     card_data: CardData | None = await get_card_data(search_term)
     if card_data is None:
+        await send_card_suggestions(update.message.from_user.id, search_term, context)
+        return
+
+    await send_card_photo(
+        chat_id=update.message.from_user.id,
+        card_data=card_data,
+        context=context,
+        caption=f"{card_data.name}\n\n{card_data.desc}",
+    )
+
+
+async def send_card_suggestions(
+    chat_id: int, search_term: str, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    suggestions = [
+        card_info
+        for card_info, score in suggest_cards(search_term, CardSuggestions.MAX_SIZE)
+        if score >= CardSuggestions.MIN_SCORE
+    ]
+    if len(suggestions) == 0:
         await context.bot.send_message(
-            update.message.from_user.id,
-            f'La carta "{search_term}" non è stata trovata.',
+            chat_id, f'La carta "{search_term}" non è stata trovata.'
         )
         return
 
-    await context.bot.send_photo(
-        update.message.from_user.id,
-        photo=get_image_bytes(card_data.image),
+    keyboard = [
+        [InlineKeyboardButton(card_info.name, callback_data=f"search:{card_info.id}")]
+        for card_info in suggestions
+    ]
+    await context.bot.send_message(
+        chat_id,
+        f'La carta "{search_term}" non è stata trovata. Forse cercavi:',
+        reply_markup=InlineKeyboardMarkup(keyboard),
+    )
+
+
+async def card_suggestion_handler(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    query = update.callback_query
+    await query.answer()
+    card_id = query.data.removeprefix("search:")
+    card_data: CardData | None = None
+    # The card store may have been refreshed since the suggestions were sent
+    if card_id.isdigit() and (card_info := get_card_info_by_id(int(card_id))):
+        card_data = await get_card_data(card_info.name)
+    if card_data is None:
+        await context.bot.send_message(
+            query.from_user.id, "Non è stato possibile trovare la carta, riprova."
+        )
+        return
+
+    await send_card_photo(
+        chat_id=query.from_user.id,
+        card_data=card_data,
+        context=context,
         caption=f"{card_data.name}\n\n{card_data.desc}",
     )
 
@@ -66,8 +117,8 @@ async def guess_game_rankings_handler(
     if length < 2:
         length = 10
 
-    rankings = get_guess_game_rankings(length=length)
-    rankings_message = get_rankings_message_from_scores(rankings)
+    rankings = await get_guess_game_rankings(length=length)
+    rankings_message = await get_rankings_message_from_scores(rankings)
     await context.bot.send_message(
         chat_id=update.message.chat.id,
         text=f"Classifica dei primi {length} giocatori:\n{rankings_message}",
@@ -0,0 +1,64 @@
+from telegram import (InlineQueryResult, InlineQueryResultArticle,
+                      InlineQueryResultCachedPhoto, InlineQueryResultPhoto,
+                      InputTextMessageContent, Update)
+from telegram.ext import ContextTypes, InlineQueryHandler
+
+from app.api import get_card_info
+from app.cache import (get_cached_card_data, peek_card_file_id,
+                       search_inline_card_names)
+from app.constants import InlineSearch, MessageLimits
+
+
+def inline_search_handlers() -> list[InlineQueryHandler]:
+    return [InlineQueryHandler(inline_search_handler)]
+
+
+async def inline_search_handler(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    search_term = update.inline_query.query
+    if not (
+        InlineSearch.MIN_QUERY_LENGTH
+        <= len(search_term.strip())
+        <= InlineSearch.MAX_QUERY_LENGTH
+    ):
+        return
+
+    # Only local indexes and caches are used here, queries arrive on every keystroke
+    results = [
+        get_inline_result(str(i), card_name)
+        for i, card_name in enumerate(search_inline_card_names(search_term))
+    ]
+    await update.inline_query.answer(results, cache_time=InlineSearch.CACHE_TIME)
+
+
+def get_inline_result(result_id: str, card_name: str) -> InlineQueryResult:
+    desc: str | None = None
+    image_url: str | None = None
+    if card_data := get_cached_card_data(card_name):
+        desc = card_data.desc
+    if card_info := get_card_info(card_name):
+        card_name = card_info.name
+        desc = card_info.desc
+        image_url = card_info.image_url
+    caption = f"{card_name}\n\n{desc}" if desc else card_name
+    caption = caption[: MessageLimits.MAX_CAPTION_LENGTH]
+
+    if file_id := peek_card_file_id(card_name):
+        return InlineQueryResultCachedPhoto(
+            id=result_id, photo_file_id=file_id, title=card_name, caption=caption
+        )
+    if image_url:
+        return InlineQueryResultPhoto(
+            id=result_id,
+            photo_url=image_url,
+            thumbnail_url=image_url,
+            title=card_name,
+            caption=caption,
+        )
+    return InlineQueryResultArticle(
+        id=result_id,
+        title=card_name,
+        description=desc[:100] if desc else None,
+        input_message_content=InputTextMessageContent(caption),
+    )
@@ -1,15 +1,11 @@
 from telegram import ReplyKeyboardRemove, Update
 from telegram.ext import CommandHandler, ContextTypes, filters
 
-from app.cache import get_feedbacks, get_user, has_role
+from app.cache import get_feedbacks, get_user, has_role, has_sent_post_today
 from app.constants import Messages, Roles
 from app.database import User
 from app.filters import AdminFilter, MainGroupFilter
-from app.message_helpers import (
-    get_user_from_command_arg,
-    has_sent_buy_post_today,
-    has_sent_sell_post_today,
-)
+from app.message_helpers import get_user_from_command_arg
 
 
 def market_handlers() -> list[CommandHandler]:
@@ -39,7 +35,7 @@ async def check_seller_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await context.bot.send_message(
             update.message.chat.id,
@@ -67,7 +63,7 @@ async def check_scammer_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await context.bot.send_message(
             update.message.chat.id,
@@ -95,7 +91,7 @@ async def check_posts_handler(
     if len(context.args) == 0:
         return
 
-    user = get_user_from_command_arg(arg=context.args[0])
+    user = await get_user_from_command_arg(arg=context.args[0])
     if user is None:
         await context.bot.send_message(
             update.message.chat.id,
@@ -106,14 +102,14 @@ async def check_posts_handler(
 
     buy_post_display = (
         "L'utente ha inviato un post di cerco oggi!"
-        if has_sent_buy_post_today(user=user)
+        if has_sent_post_today(user, "buy")
         else "L'utente NON ha inviato un post di cerco oggi!"
     )
     sell_post_display = ""
     if has_role(user.id, Roles.SELLER):
         sell_post_display = (
             "L'utente ha inviato un post di vendo oggi!"
-            if has_sent_sell_post_today(user=user)
+            if has_sent_post_today(user, "sell")
             else "L'utente NON ha inviato un post di vendo oggi!"
         )
     else:
@@ -132,7 +128,7 @@ async def feedback_list_handler(
     if len(context.args) == 0:
         return
 
-    seller = get_user_from_command_arg(arg=context.args[0])
+    seller = await get_user_from_command_arg(arg=context.args[0])
     if seller is None:
         await context.bot.send_message(
             update.message.from_user.id,
@@ -148,7 +144,7 @@ async def feedback_list_handler(
         )
         return
 
-    feedbacks = get_feedbacks(seller.id)
+    feedbacks = await get_feedbacks(seller.id)
     if len(feedbacks) == 0:
         await context.bot.send_message(
             update.message.from_user.id,
@@ -157,7 +153,7 @@ async def feedback_list_handler(
         )
         return
     for feedback in feedbacks:
-        buyer: User | None = get_user(id=feedback.buyer_id)
+        buyer: User | None = await get_user(id=feedback.buyer_id)
         if buyer is None:
             continue
         if buyer.first_name is None:
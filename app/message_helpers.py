@@ -1,5 +1,6 @@
+import logging
 import re
-from datetime import datetime
+from functools import lru_cache
 from typing import Literal
 
 from telegram import Message, ReplyKeyboardRemove
@@ -7,23 +8,24 @@ from telegram.error import BadRequest, Forbidden, TimedOut
 from telegram.ext import ContextTypes
 from telegram.helpers import effective_message_type
 
-from app.cache import get_user
+from app.cache import (CardData, get_card_file_id, get_user,
+                       remove_card_file_id, set_card_file_id)
 from app.constants import MessageLimits
 from app.database import User
 
 
-def get_user_from_command_arg(arg: str) -> User | None:
+async def get_user_from_command_arg(arg: str) -> User | None:
     if len(arg) > MessageLimits.MAX_USERNAME_LENGTH + 1:
         return None
 
     arg = arg.replace("@", "")
     if arg.isnumeric():
-        return get_user(id=int(arg))
+        return await get_user(id=int(arg))
     else:
-        return get_user(username=arg)
+        return await get_user(username=arg)
 
 
-def get_user_from_text(message_text: str) -> User | None:
+async def get_user_from_text(message_text: str) -> User | None:
     if "@" not in message_text:
         return None
 
@@ -31,7 +33,7 @@ def get_user_from_text(message_text: str) -> User | None:
         if "@" in word:
             username = remove_non_alpha_characters(word)
             if len(username) > 0:
-                if user := get_user(username=username):
+                if user := await get_user(username=username):
                     return user
 
     return None
@@ -41,6 +43,72 @@ def remove_non_alpha_characters(text: str) -> str:
     return re.sub(r"[^a-zA-Z0-9_]", "", text)
 
 
+def get_lcs_length(a: str, b: str) -> int:
+    # Bit-parallel longest common subsequence, one bit of row per char of a
+    char_masks: dict[str, int] = {}
+    for i, char in enumerate(a):
+        char_masks[char] = char_masks.get(char, 0) | 1 << i
+    full_mask = (1 << len(a)) - 1
+    row = full_mask
+    for char in b:
+        matches = row & char_masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full_mask
+    return len(a) - row.bit_count()
+
+
+def is_close_match(guess: str, answer: str, threshold: float) -> bool:
+    total_length = len(guess) + len(answer)
+    max_distance = int((1 - threshold) * total_length + 1e-9)
+    # Every extra char is at least one insertion or deletion
+    if abs(len(guess) - len(answer)) > max_distance:
+        return False
+    if guess == answer:
+        return True
+    # An LCS is never shorter than SequenceMatcher's matching blocks, so this
+    # accepts every guess ratio() accepts plus some with swapped letters
+    return total_length - 2 * get_lcs_length(answer, guess) <= max_distance
+
+
+async def delete_messages(
+    messages: list[tuple[int, int]], context: ContextTypes.DEFAULT_TYPE
+) -> list[tuple[int, int]]:
+    message_ids: dict[int, list[int]] = {}
+    for chat_id, message_id in messages:
+        message_ids.setdefault(chat_id, []).append(message_id)
+
+    timed_out: list[tuple[int, int]] = []
+    deleted_count = 0
+    failed_count = 0
+    chunk_size = MessageLimits.MAX_DELETE_MESSAGES
+    for chat_id, ids in message_ids.items():
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i : i + chunk_size]
+            try:
+                await context.bot.delete_messages(chat_id=chat_id, message_ids=chunk)
+                deleted_count += len(chunk)
+            except TimedOut:
+                timed_out.extend((chat_id, message_id) for message_id in chunk)
+            except (Forbidden, BadRequest) as err:
+                failed_count += len(chunk)
+                logging.log(logging.ERROR, f"Could not delete messages: {err!r}")
+
+    logging.log(
+        logging.INFO,
+        f"Deleted {deleted_count} messages, {failed_count} failed, "
+        f"{len(timed_out)} timed out",
+    )
+    return timed_out
+
+
+async def messages_cleaner_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    messages: list[tuple[int, int]] = context.job.data
+    timed_out = await delete_messages(list(messages), context)
+    messages.clear()
+    messages.extend(timed_out)
+    if len(messages) == 0:
+        context.job.schedule_removal()
+
+
 async def send_message_with_bot(
     recipient_id: int, message_to_send: Message, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
@@ -91,7 +159,46 @@ async def send_message_with_bot(
             raise Forbidden
 
 
-def get_rankings_message_from_scores(users_scores: dict[int, int]) -> str:
+FILE_ID_ERRORS = (
+    "wrong file identifier",
+    "wrong remote file identifier",
+    "file reference expired",
+    "invalid file_id",
+    "wrong padding",
+)
+
+
+def is_file_id_error(err: BadRequest) -> bool:
+    message = err.message.lower()
+    return any(error in message for error in FILE_ID_ERRORS)
+
+
+async def send_card_photo(
+    chat_id: int,
+    card_data: CardData,
+    context: ContextTypes.DEFAULT_TYPE,
+    caption: str | None = None,
+) -> Message:
+    if file_id := await get_card_file_id(card_data.name):
+        try:
+            return await context.bot.send_photo(
+                chat_id=chat_id, photo=file_id, caption=caption
+            )
+        except BadRequest as err:
+            # Errors about the chat or the caption say nothing about the file_id
+            if not is_file_id_error(err):
+                raise
+            await remove_card_file_id(card_data.name)
+
+    message = await context.bot.send_photo(
+        chat_id=chat_id, photo=card_data.image_bytes, caption=caption
+    )
+    if message.photo:
+        await set_card_file_id(card_data.name, message.photo[-1].file_id)
+    return message
+
+
+async def get_rankings_message_from_scores(users_scores: dict[int, int]) -> str:
     scores: list[tuple[str, int]] = []
     for key in sorted(
         users_scores,
@@ -99,7 +206,7 @@ def get_rankings_message_from_scores(users_scores: dict[int, int]) -> str:
         reverse=True,
     ):
         value = users_scores[key]
-        user = get_user(key)
+        user = await get_user(key)
         user_to_display = ""
         if user.username:
             user_to_display = "@" + user.username
@@ -125,38 +232,61 @@ def get_rankings_message_from_scores(users_scores: dict[int, int]) -> str:
     return rankings
 
 
-def is_sell_post(text: str) -> bool:
-    text = text.lower()
-    if text == "up":
-        return True
-    keywords = [
-        "vendo",
-        "vendere",
-        "vendesi",
-        "vendono,",
-        "ammortizzo",
-        "ammortizzare",
-        "scambio",
-        "scambiare",
-    ]
-    return True if any(word in text for word in keywords) else False
+type PostType = Literal["sell", "buy", "feedback", "none"]
 
+POST_KEYWORDS: dict[str, PostType] = {
+    "feed": "feedback",
+    "feedb": "feedback",
+    "feedback": "feedback",
+    "vendo": "sell",
+    "vendere": "sell",
+    "vendesi": "sell",
+    "vendono": "sell",
+    "svendo": "sell",
+    "svendere": "sell",
+    "svendesi": "sell",
+    "svendono": "sell",
+    "ammortizzo": "sell",
+    "ammortizzare": "sell",
+    "scambio": "sell",
+    "scambiare": "sell",
+    "cerco": "buy",
+    "cercare": "buy",
+    "cercasi": "buy",
+    "cercano": "buy",
+    "compro": "buy",
+}
 
-def is_buy_post(text: str) -> bool:
-    text = text.lower()
-    keywords = ["cerco", "compro", "cercare", "cercasi", "cercano"]
-    return True if any(word in text for word in keywords) else False
+WORD_PATTERN = re.compile(r"[^\W_]+")
 
 
-def is_feedback_post(text: str) -> bool:
-    text = text.lower()
-    keywords = ["feedback", "feed", "feedb"]
-    return True if any(word in text for word in keywords) else False
+@lru_cache(maxsize=1024)
+def get_post_keywords(text: str) -> frozenset[PostType]:
+    if len(text) == 2 and text.lower() == "up":
+        return frozenset(("sell",))
+    return frozenset(
+        [
+            POST_KEYWORDS[word]
+            for word in WORD_PATTERN.findall(text.casefold())
+            if word in POST_KEYWORDS
+        ]
+    )
 
 
-def has_sent_buy_post_today(user: User) -> bool:
-    return True if user.last_buy_post.date() == datetime.today().date() else False
+def get_post_type(text: str) -> PostType:
+    keywords = get_post_keywords(text)
+    # Feedback wins over sell and sell over buy, as the handlers used to check
+    for post_type in ("feedback", "sell", "buy"):
+        if post_type in keywords:
+            return post_type
+    return "none"
 
 
-def has_sent_sell_post_today(user: User) -> bool:
-    return True if user.last_sell_post.date() == datetime.today().date() else False
+def get_market_post_type(text: str, album: bool = False) -> PostType:
+    keywords = get_post_keywords(text)
+    # Feedbacks are only sent as text, a caption mentioning them is still a
+    # post, and albums have always checked buy before sell
+    for post_type in ("buy", "sell") if album else ("sell", "buy"):
+        if post_type in keywords:
+            return post_type
+    return "none"
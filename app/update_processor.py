@@ -0,0 +1,89 @@
+import asyncio
+import inspect
+import logging
+import os
+from typing import Any, Awaitable
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from app.constants import UpdateProcessing
+
+type UpdateKey = tuple[str, int]
+
+
+def get_max_concurrent_updates() -> int:
+    value = os.getenv("MAX_CONCURRENT_UPDATES")
+    if value is None:
+        return UpdateProcessing.MAX_CONCURRENT_UPDATES
+    try:
+        max_concurrent_updates = int(value)
+    except ValueError:
+        logging.log(
+            logging.ERROR, f"Invalid MAX_CONCURRENT_UPDATES {value!r}, using default"
+        )
+        return UpdateProcessing.MAX_CONCURRENT_UPDATES
+    clamped = min(max(max_concurrent_updates, 1), UpdateProcessing.MAX_PENDING_UPDATES)
+    if clamped != max_concurrent_updates:
+        logging.log(
+            logging.ERROR, f"MAX_CONCURRENT_UPDATES {value!r} clamped to {clamped}"
+        )
+    return clamped
+
+
+def get_update_keys(update: object) -> tuple[UpdateKey, ...]:
+    if not isinstance(update, Update):
+        return ()
+    keys: list[UpdateKey] = []
+    if update.effective_chat is not None:
+        keys.append(("chat", update.effective_chat.id))
+    if update.effective_user is not None:
+        keys.append(("user", update.effective_user.id))
+    return tuple(keys)
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    def __init__(self, max_concurrent_updates: int, max_pending_updates: int) -> None:
+        if max_concurrent_updates < 1:
+            raise ValueError("max_concurrent_updates must be at least 1")
+        if max_pending_updates < max_concurrent_updates:
+            raise ValueError(
+                "max_pending_updates must be at least max_concurrent_updates"
+            )
+        # The base semaphore is held while an update waits for its chat, so it
+        # only bounds pending updates and a second one bounds the running ones
+        super().__init__(max_pending_updates)
+        self.running = asyncio.BoundedSemaphore(max_concurrent_updates)
+        self.tails: dict[UpdateKey, asyncio.Future[None]] = {}
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        keys = get_update_keys(update)
+        previous = {self.tails[key] for key in keys if key in self.tails}
+        done = asyncio.get_running_loop().create_future()
+        for key in keys:
+            self.tails[key] = done
+
+        try:
+            if previous:
+                await asyncio.wait(previous)
+            async with self.running:
+                await coroutine
+        finally:
+            # Cancelled before its turn came, the update never started
+            if (
+                inspect.iscoroutine(coroutine)
+                and inspect.getcoroutinestate(coroutine) == inspect.CORO_CREATED
+            ):
+                coroutine.close()
+            done.set_result(None)
+            for key in keys:
+                if self.tails.get(key) is done:
+                    del self.tails[key]
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self.tails.clear()
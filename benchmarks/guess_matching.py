@@ -0,0 +1,96 @@
+import random
+import string
+import timeit
+from difflib import SequenceMatcher
+
+from app.constants import GuessGame
+from app.message_helpers import is_close_match, remove_non_alpha_characters
+
+ANSWERS = [
+    "Dark Magician",
+    "Blue-Eyes White Dragon",
+    "Hexa Spirit of the Ice Barrier",
+    "Ash Blossom & Joyous Spring",
+    "Pot of Greed",
+    "Trishula, Dragon of the Ice Barrier",
+    "Elemental HERO Neos",
+    "Raigeki",
+]
+
+
+def get_typo(word: str, typos: int, rnd: random.Random) -> str:
+    chars = list(word)
+    for _ in range(typos):
+        i = rnd.randrange(len(chars))
+        match rnd.randrange(3):
+            case 0:
+                chars[i] = rnd.choice(string.ascii_lowercase)
+            case 1:
+                del chars[i]
+            case _:
+                chars.insert(i, rnd.choice(string.ascii_lowercase))
+    return "".join(chars)
+
+
+def get_transposition(word: str, swaps: int, rnd: random.Random) -> str:
+    chars = list(word)
+    for _ in range(swaps):
+        i = rnd.randrange(len(chars) - 1)
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars)
+
+
+def get_guesses(rnd: random.Random) -> list[tuple[str, str]]:
+    answers = [remove_non_alpha_characters(answer).lower() for answer in ANSWERS]
+    guesses: list[tuple[str, str]] = []
+    for answer in answers:
+        for typos in range(4):
+            for _ in range(25):
+                guesses.append((get_typo(answer, typos, rnd), answer))
+        for swaps in range(1, 4):
+            for typos in range(2):
+                for _ in range(25):
+                    typo = get_typo(answer, typos, rnd)
+                    guesses.append((get_transposition(typo, swaps, rnd), answer))
+        for other in answers:
+            guesses.append((other, answer))
+    return guesses
+
+
+def sequence_matcher(guess: str, answer: str) -> bool:
+    return SequenceMatcher(None, guess, answer).ratio() >= GuessGame.CORRECT_THRESHOLD
+
+
+def indel_distance(guess: str, answer: str) -> bool:
+    return is_close_match(guess, answer, GuessGame.CORRECT_THRESHOLD)
+
+
+def main() -> None:
+    guesses = get_guesses(random.Random(0))
+    results = [
+        (sequence_matcher(guess, answer), indel_distance(guess, answer))
+        for guess, answer in guesses
+    ]
+    agreements = sum(old == new for old, new in results)
+    only_new = sum(new and not old for old, new in results)
+    only_old = sum(old and not new for old, new in results)
+    print(f"{len(guesses)} guesses, threshold {GuessGame.CORRECT_THRESHOLD}")
+    print(f"agreement: {agreements / len(guesses):.2%}")
+    print(f"accepted only by {indel_distance.__name__}: {only_new}")
+    print(f"accepted only by {sequence_matcher.__name__}: {only_old}")
+    for scorer in (sequence_matcher, indel_distance):
+        seconds = min(
+            timeit.repeat(
+                lambda scorer=scorer: [
+                    scorer(guess, answer) for guess, answer in guesses
+                ],
+                number=10,
+                repeat=5,
+            )
+        )
+        per_guess = seconds / (10 * len(guesses)) * 1e6
+        print(f"{scorer.__name__}: {per_guess:.2f} us per guess")
+
+
+if __name__ == "__main__":
+    main()
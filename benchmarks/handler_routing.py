@@ -0,0 +1,155 @@
+import timeit
+from datetime import datetime
+
+from telegram import (CallbackQuery, Chat, InlineQuery, Message, MessageEntity,
+                      Update, User)
+from telegram.ext import BaseHandler, ExtBot
+from telegram.ext.filters import MessageFilter
+
+from app.config import approval_id, main_id, market_id
+from app.handlers import handler_groups, handlers
+from app.handlers.routing import RoutedHandlerGroup
+
+
+class BenchmarkBot(ExtBot):
+    @property
+    def username(self) -> str:
+        return "hexabenchbot"
+
+
+filter_evaluations = 0
+message_filter_check = MessageFilter.check_update
+
+
+def counted_check_update(self: MessageFilter, update: Update) -> bool:
+    global filter_evaluations
+    filter_evaluations += 1
+    return message_filter_check(self, update)
+
+
+def make_message(chat: Chat, text: str, media_group_id: str | None = None) -> Message:
+    entities = []
+    if text.startswith("/"):
+        entities.append(
+            MessageEntity(MessageEntity.BOT_COMMAND, 0, len(text.split()[0]))
+        )
+    return Message(
+        1,
+        datetime.now(),
+        chat,
+        from_user=User(42, "user", False),
+        text=text,
+        entities=entities,
+        media_group_id=media_group_id,
+    )
+
+
+def make_updates() -> list[tuple[str, Update]]:
+    market = Chat(market_id(), Chat.SUPERGROUP)
+    main = Chat(main_id(), Chat.SUPERGROUP)
+    approval = Chat(approval_id(), Chat.SUPERGROUP)
+    private = Chat(42, Chat.PRIVATE)
+    group = Chat(-1000000000001, Chat.SUPERGROUP)
+    user = User(42, "user", False)
+    updates = [
+        ("market sell post", Update(1, message=make_message(market, "vendo tutto"))),
+        ("market buy post", Update(2, message=make_message(market, "cerco carte"))),
+        (
+            "market media group",
+            Update(3, message=make_message(market, "vendo", media_group_id="1")),
+        ),
+        ("main text", Update(4, message=make_message(main, "ciao a tutti"))),
+        ("main /search", Update(5, message=make_message(main, "/search hexa"))),
+        (
+            "approval /makeseller",
+            Update(6, message=make_message(approval, "/makeseller @user")),
+        ),
+        ("private /start", Update(7, message=make_message(private, "/start"))),
+        ("private text", Update(8, message=make_message(private, "ciao"))),
+        ("group text", Update(9, message=make_message(group, "ciao"))),
+        (
+            "callback query",
+            Update(
+                10,
+                callback_query=CallbackQuery(
+                    "1", user, "1", message=make_message(main, "hexa"), data="x"
+                ),
+            ),
+        ),
+        ("inline query", Update(11, inline_query=InlineQuery("1", user, "hexa", ""))),
+    ]
+    bot = BenchmarkBot("123456:benchmark")
+    for _, update in updates:
+        update.set_bot(bot)
+        if update.effective_message is not None:
+            update.effective_message.set_bot(bot)
+    return updates
+
+
+def check_groups(
+    groups: dict[int, list[BaseHandler]], update: Update
+) -> list[BaseHandler]:
+    matched = []
+    for group_handlers in groups.values():
+        for handler in group_handlers:
+            check = handler.check_update(update)
+            if not (check is None or check is False):
+                if isinstance(handler, RoutedHandlerGroup):
+                    handler = check[0]
+                matched.append(handler)
+                break
+    return matched
+
+
+def count_filter_evaluations(
+    groups: dict[int, list[BaseHandler]], update: Update
+) -> int:
+    global filter_evaluations
+    filter_evaluations = 0
+    MessageFilter.check_update = counted_check_update
+    try:
+        check_groups(groups, update)
+    finally:
+        MessageFilter.check_update = message_filter_check
+    return filter_evaluations
+
+
+def main() -> None:
+    updates = make_updates()
+    totals = {"all groups": [0, 0.0], "routed": [0, 0.0]}
+    for name, update in updates:
+        assert check_groups(handler_groups, update) == check_groups(
+            handlers, update
+        ), f"{name}: routing changed the matched handlers"
+        row = []
+        for label, groups in (("all groups", handler_groups), ("routed", handlers)):
+            evaluations = count_filter_evaluations(groups, update)
+            seconds = (
+                min(
+                    timeit.repeat(
+                        lambda groups=groups, update=update: check_groups(
+                            groups, update
+                        ),
+                        number=2000,
+                        repeat=5,
+                    )
+                )
+                / 2000
+            )
+            totals[label][0] += evaluations
+            totals[label][1] += seconds
+            row.append((evaluations, seconds * 1e6))
+        print(
+            f"{name}: {row[0][0]} -> {row[1][0]} filter evaluations, "
+            f"{row[0][1]:.1f} -> {row[1][1]:.1f} us"
+        )
+
+    for label, (evaluations, seconds) in totals.items():
+        print(
+            f"{label}: {evaluations / len(updates):.1f} filter evaluations, "
+            f"{seconds / len(updates) * 1e6:.1f} us per update"
+        )
+
+
+if __name__ == "__main__":
+    main()
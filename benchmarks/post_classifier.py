@@ -0,0 +1,89 @@
+import json
+import os
+import timeit
+
+from app.message_helpers import (PostType, get_market_post_type,
+                                 get_post_keywords, get_post_type)
+
+CORPUS_PATH = "tests/data/market_posts.json"
+
+
+SELL_KEYWORDS = [
+    "vendo",
+    "vendere",
+    "vendesi",
+    "vendono,",
+    "ammortizzo",
+    "ammortizzare",
+    "scambio",
+    "scambiare",
+]
+BUY_KEYWORDS = ["cerco", "compro", "cercare", "cercasi", "cercano"]
+FEEDBACK_KEYWORDS = ["feedback", "feed", "feedb"]
+
+
+def keyword_post_type(text: str, kind: str) -> PostType:
+    text = text.lower()
+    keywords: set[PostType] = set()
+    if any(word in text for word in FEEDBACK_KEYWORDS):
+        keywords.add("feedback")
+    if text == "up" or any(word in text for word in SELL_KEYWORDS):
+        keywords.add("sell")
+    if any(word in text for word in BUY_KEYWORDS):
+        keywords.add("buy")
+    return pick_post_type(keywords, kind)
+
+
+def pick_post_type(
+    keywords: frozenset[PostType] | set[PostType], kind: str
+) -> PostType:
+    order = {
+        "text": ("feedback", "sell", "buy"),
+        "caption": ("sell", "buy"),
+        "album": ("buy", "sell"),
+    }[kind]
+    for post_type in order:
+        if post_type in keywords:
+            return post_type
+    return "none"
+
+
+def word_post_type(text: str, kind: str) -> PostType:
+    return pick_post_type(get_post_keywords.__wrapped__(text), kind)
+
+
+def repeat_post_type(text: str, kind: str) -> PostType:
+    if kind == "text":
+        return get_post_type(text)
+    return get_market_post_type(text, album=kind == "album")
+
+
+def main() -> None:
+    with open(os.path.abspath(CORPUS_PATH), "r") as f:
+        corpus: list[dict[str, str]] = list(json.load(f))
+    posts = [(post["text"], post.get("kind", "text"), post["label"]) for post in corpus]
+
+    print(f"{len(posts)} labelled posts")
+    # Live messages are nearly all unique, so the uncached classifiers give the
+    # per-message cost and repeat_post_type only times lru_cache hits
+    for classifier in (keyword_post_type, word_post_type, repeat_post_type):
+        correct = sum(classifier(text, kind) == label for text, kind, label in posts)
+        seconds = min(
+            timeit.repeat(
+                lambda classifier=classifier: [
+                    classifier(text, kind) for text, kind, _ in posts
+                ],
+                number=200,
+                repeat=5,
+            )
+        )
+        per_message = seconds / (200 * len(posts)) * 1e6
+        unit = "repeat lookup" if classifier is repeat_post_type else "message"
+        print(
+            f"{classifier.__name__}: accuracy {correct / len(posts):.2%}, "
+            f"{per_message:.2f} us per {unit}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from telegram import LinkPreviewOptions
 from telegram.ext import Defaults
 
 from app import Bot, BotParameters
-from app.database import create_database
+from app.database import close_pool, create_database
 from app.handlers import handlers
 from app.logger import set_up_logger
 
@@ -27,6 +27,7 @@ def main() -> None:
 
     set_up_logger()
     create_database()
+    close_pool()
 
     bot_token = os.getenv("BOT_TOKEN")
     if bot_token is None:
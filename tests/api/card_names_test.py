@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from app.api import get_random_card_name, search_card_names
+from app.api.card_names import (build_card_names, parse_card_names,
+                                read_card_names, set_card_names)
+from app.api.card_store import write_card_dump
+
+
+class CardNamesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        set_card_names(
+            build_card_names(
+                [
+                    "Dark Magician",
+                    "Dark Magician Girl",
+                    "Dark Hole",
+                    "Magician of Black Chaos",
+                    "Blue-Eyes White Dragon",
+                ]
+            )
+        )
+
+    def tearDown(self) -> None:
+        set_card_names(build_card_names([]))
+
+    def test_prefix_results(self) -> None:
+        self.assertEqual(
+            search_card_names("dark ma", k=2), ["Dark Magician", "Dark Magician Girl"]
+        )
+        self.assertEqual(search_card_names("DARK H", k=1), ["Dark Hole"])
+
+    def test_fuzzy_results(self) -> None:
+        results = search_card_names("blue eyes", k=3)
+        self.assertEqual(results[0], "Blue-Eyes White Dragon")
+        results = search_card_names("dark", k=5)
+        self.assertEqual(
+            results[:3], ["Dark Hole", "Dark Magician", "Dark Magician Girl"]
+        )
+        self.assertEqual(len(results), len(set(results)))
+        self.assertEqual(search_card_names("zzzz"), [])
+
+    def test_random_card_name(self) -> None:
+        used_names: set[str] = set()
+        for _ in range(5):
+            name = get_random_card_name(used_names)
+            self.assertEqual(name in used_names, False)
+            used_names.add(name)
+        self.assertEqual(get_random_card_name(used_names), None)
+
+    def test_parse_card_names(self) -> None:
+        self.assertEqual(
+            parse_card_names(b'{"Dark Hole": [1], "Raigeki": [2]}'),
+            ["Dark Hole", "Raigeki"],
+        )
+        for raw_names in (b'{"Dark Hole": [1', b"[]", b"{}", b"null"):
+            with self.assertRaises(ValueError):
+                parse_card_names(raw_names)
+
+    def test_write_card_names(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "card_names.json")
+            write_card_dump(path, b'{"Dark Hole": [1]}')
+            self.assertEqual(os.listdir(directory), ["card_names.json"])
+            self.assertEqual(read_card_names(path).choices, ("Dark Hole",))
+
+
+if __name__ == "__main__":
+    unittest.main()
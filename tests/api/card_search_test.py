@@ -0,0 +1,30 @@
+import unittest
+from io import BytesIO
+
+from PIL import Image
+
+from app.api import (close_image_executor, get_image_bytes, render_card_frames,
+                     render_crop_levels)
+
+
+class CardSearchTest(unittest.TestCase):
+    def test_render_crop_levels(self) -> None:
+        image_bytes = get_image_bytes(Image.new("RGB", (120, 90), (10, 20, 30)))
+        frames = render_crop_levels(image_bytes)
+        self.assertEqual(len(frames), 5)
+        for frame in frames:
+            self.assertEqual(Image.open(BytesIO(frame)).size, (120, 90))
+
+
+class ImageWorkerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self) -> None:
+        close_image_executor()
+
+    async def test_render_card_frames(self) -> None:
+        image_bytes = get_image_bytes(Image.new("RGB", (120, 90), (10, 20, 30)))
+        frames = await render_card_frames(image_bytes)
+        self.assertEqual(len(frames), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
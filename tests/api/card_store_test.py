@@ -0,0 +1,67 @@
+import json
+import unittest
+
+from app.api import find_card, get_card_info_by_id, suggest_cards
+from app.api.card_store import parse_card_dump, set_cards
+
+
+def make_card(card_id: int, name: str) -> dict:
+    return {
+        "id": card_id,
+        "name": name,
+        "desc": f"{name} description",
+        "card_images": [{"image_url_cropped": f"https://example.com/{name}.jpg"}],
+    }
+
+
+class CardStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        dump = {
+            "data": [
+                make_card(46986414, "Dark Magician"),
+                make_card(38033121, "Dark Magician Girl"),
+                make_card(89631139, "Blue-Eyes White Dragon"),
+                {"id": 1, "name": "No Image", "desc": "", "card_images": []},
+                {
+                    "name": "No Id",
+                    "desc": "",
+                    "card_images": [{"image_url_cropped": "https://example.com/"}],
+                },
+            ]
+        }
+        set_cards(parse_card_dump(json.dumps(dump).encode()))
+
+    def tearDown(self) -> None:
+        set_cards({})
+
+    def test_parse_card_dump(self) -> None:
+        self.assertEqual(find_card("No Image"), None)
+        self.assertEqual(find_card("No Id"), None)
+        card = find_card("Blue-Eyes White Dragon")
+        self.assertNotEqual(card, None)
+        self.assertEqual(
+            card.image_url, "https://example.com/Blue-Eyes White Dragon.jpg"
+        )
+
+    def test_find_card(self) -> None:
+        self.assertEqual(find_card("  dark   MAGICIAN ").name, "Dark Magician")
+        self.assertEqual(find_card("magician girl").name, "Dark Magician Girl")
+        self.assertEqual(find_card("blue-eyes").name, "Blue-Eyes White Dragon")
+        self.assertEqual(find_card("dark"), None)
+        self.assertEqual(find_card("exodia"), None)
+
+    def test_get_card_info_by_id(self) -> None:
+        self.assertEqual(get_card_info_by_id(38033121).name, "Dark Magician Girl")
+        self.assertEqual(get_card_info_by_id(1), None)
+        self.assertEqual(get_card_info_by_id(12345), None)
+
+    def test_suggest_cards(self) -> None:
+        suggestions = suggest_cards("dark magicain", k=2)
+        self.assertEqual(
+            [card.name for card, _ in suggestions],
+            ["Dark Magician", "Dark Magician Girl"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from app.api import FuzzyIndex
+
+
+class FuzzyIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = FuzzyIndex(
+            (
+                "blue-eyes white dragon",
+                "dark magician",
+                "dark magician girl",
+                "red-eyes black dragon",
+            )
+        )
+
+    def test_ranking(self) -> None:
+        results = self.index.search("dark magican", k=2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][0], "dark magician")
+        self.assertEqual(results[1][0], "dark magician girl")
+        self.assertEqual(results[0][1] > results[1][1], True)
+
+        results = self.index.search("blue eyes white dragon", k=1)
+        self.assertEqual(results[0][0], "blue-eyes white dragon")
+
+    def test_scores(self) -> None:
+        self.assertEqual(self.index.search("dark magician", k=1)[0][1], 1.0)
+        self.assertEqual(self.index.search("zzzz"), [])
+        self.assertEqual(FuzzyIndex().search("dark magician"), [])
+
+    def test_find_containing(self) -> None:
+        self.assertEqual(
+            self.index.find_containing("magician"),
+            ["dark magician", "dark magician girl"],
+        )
+        self.assertEqual(
+            self.index.find_containing("magician", limit=1), ["dark magician"]
+        )
+        self.assertEqual(self.index.find_containing("n g"), ["dark magician girl"])
+        self.assertEqual(
+            self.index.find_containing("-e"),
+            ["blue-eyes white dragon", "red-eyes black dragon"],
+        )
+        self.assertEqual(self.index.find_containing("dragon blue"), [])
+        self.assertEqual(self.index.find_containing("zzzz"), [])
+
+        # Same result as scanning every name
+        for word in ("dark", "eyes", "agi", "ck d", "white dragon", "rl"):
+            self.assertEqual(
+                self.index.find_containing(word),
+                [name for name in self.index.names if word in name],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from datetime import datetime
 
@@ -20,3 +21,13 @@ class CardDataTest(unittest.IsolatedAsyncioTestCase):
         card_data: CardData = await get_card_data("candina")
         time_ms = (datetime.now() - start_time).microseconds / 1000
         self.assertEqual(time_ms < 10, True)
+
+    async def test_coalesced_lookups(self) -> None:
+        results = await asyncio.gather(
+            get_card_data("Trickstar Lilybell"),
+            get_card_data("trickstar lilybell"),
+            get_card_data("  Trickstar   LILYBELL "),
+        )
+        self.assertEqual(results[0] is not None, True)
+        self.assertEqual(results[0] is results[1], True)
+        self.assertEqual(results[0] is results[2], True)
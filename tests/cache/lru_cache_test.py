@@ -0,0 +1,59 @@
+import time
+import unittest
+from datetime import timedelta
+
+from app.cache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_size_bound(self) -> None:
+        cache: LRUCache[int, str] = LRUCache(max_size=3)
+        for i in range(10):
+            cache.set(i, str(i))
+            self.assertEqual(len(cache) <= 3, True)
+        self.assertEqual(cache.get(0), None)
+        self.assertEqual(cache.get(9), "9")
+
+    def test_lru_order(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertEqual("a" in cache, True)
+        self.assertEqual("b" in cache, False)
+        self.assertEqual("c" in cache, True)
+
+    def test_ttl(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(
+            max_size=10, ttl=timedelta(milliseconds=20)
+        )
+        cache.set("short", 1)
+        cache.set("long", 2, ttl=timedelta(seconds=10))
+        time.sleep(0.05)
+        self.assertEqual("short" in cache, False)
+        self.assertEqual(cache.get("short"), None)
+        self.assertEqual(cache.get("long"), 2)
+
+    def test_none_values(self) -> None:
+        cache: LRUCache[str, str | None] = LRUCache(max_size=10)
+        cache.set("missing", None)
+        self.assertEqual("missing" in cache, True)
+        self.assertEqual(cache.get("missing", "default"), None)
+        self.assertEqual(cache.get("other", "default"), "default")
+        cache.pop("missing")
+        self.assertEqual("missing" in cache, False)
+
+    def test_weight_bound(self) -> None:
+        cache: LRUCache[str, bytes] = LRUCache(max_weight=10, weigher=len)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        self.assertEqual(cache.weight, 8)
+        cache.set("c", b"1234")
+        self.assertEqual("a" in cache, False)
+        self.assertEqual(cache.weight, 8)
+
+        cache.set("b", b"12")
+        self.assertEqual(cache.weight, 6)
+        cache.pop("b")
+        self.assertEqual(cache.weight, 4)
@@ -0,0 +1,147 @@
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from app.cache import consume_post_quota, flush_post_quota, has_sent_post_today
+from app.cache.post_quota import post_quota, release_post_quota
+from app.constants import Dates
+from app.database import User, get_user_from_id
+from tests.data import (clear_test_database, close_async_pool,
+                        create_test_database, mock_users)
+
+
+def reset_ledger() -> None:
+    post_quota.day = date.today()
+    post_quota.used = set()
+    post_quota.pending = {}
+    post_quota.flushing = {}
+
+
+def make_user(id: int) -> User:
+    return User((id, None, None, None, Dates.MARKET_EPOCH, Dates.MARKET_EPOCH))
+
+
+class PostQuotaTest(unittest.TestCase):
+    def setUp(self) -> None:
+        reset_ledger()
+
+    def test_consume_once_per_day(self) -> None:
+        user = make_user(1)
+        self.assertFalse(has_sent_post_today(user, "sell"))
+        self.assertTrue(consume_post_quota(user, "sell"))
+        self.assertFalse(consume_post_quota(user, "sell"))
+        self.assertTrue(has_sent_post_today(user, "sell"))
+        self.assertEqual(user.last_sell_post.date(), date.today())
+
+        self.assertTrue(consume_post_quota(user, "buy"))
+        self.assertFalse(consume_post_quota(user, "buy"))
+        self.assertTrue(consume_post_quota(make_user(2), "buy"))
+
+    def test_ledger_is_authoritative(self) -> None:
+        user = make_user(1)
+        self.assertTrue(consume_post_quota(user, "buy"))
+        # A stale copy of the user read from the database before the flush
+        self.assertFalse(consume_post_quota(make_user(1), "buy"))
+
+    def test_reads_previous_dates(self) -> None:
+        user = make_user(1)
+        user.last_buy_post = datetime.now()
+        self.assertFalse(consume_post_quota(user, "buy"))
+        user.last_sell_post = datetime.now() - timedelta(days=1)
+        self.assertTrue(consume_post_quota(user, "sell"))
+
+    def test_day_reset(self) -> None:
+        user = make_user(1)
+        self.assertTrue(consume_post_quota(user, "sell"))
+        post_quota.day = date.today() - timedelta(days=1)
+        user.last_sell_post = datetime.now() - timedelta(days=1)
+        self.assertTrue(consume_post_quota(user, "sell"))
+        self.assertEqual(post_quota.day, date.today())
+
+    def test_pending_writes(self) -> None:
+        user = make_user(1)
+        consume_post_quota(user, "buy")
+        consume_post_quota(user, "sell")
+        last_buy_post, last_sell_post = post_quota.pending[user.id]
+        self.assertEqual(last_buy_post, user.last_buy_post)
+        self.assertEqual(last_sell_post, user.last_sell_post)
+
+        release_post_quota(user.id, "buy")
+        self.assertEqual(post_quota.pending[user.id], (None, user.last_sell_post))
+        self.assertNotIn((user.id, "buy"), post_quota.used)
+
+        release_post_quota(user.id, "sell")
+        self.assertNotIn(user.id, post_quota.pending)
+
+
+class PostQuotaFlushFailureTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        reset_ledger()
+
+    async def test_failed_flush_is_requeued(self) -> None:
+        first, second = make_user(1), make_user(2)
+        consume_post_quota(first, "sell")
+        consume_post_quota(second, "sell")
+
+        async def failed_write(post_dates: list) -> bool:
+            # Posts consumed while the write is in flight stay queued too
+            consume_post_quota(first, "buy")
+            return False
+
+        with patch("app.database.update_users_post_dates", side_effect=failed_write):
+            with self.assertLogs(level="ERROR"):
+                await flush_post_quota()
+
+        self.assertEqual(
+            post_quota.pending,
+            {
+                first.id: (first.last_buy_post, first.last_sell_post),
+                second.id: (None, second.last_sell_post),
+            },
+        )
+        self.assertEqual(post_quota.flushing, {})
+
+        with patch("app.database.update_users_post_dates", return_value=True):
+            await flush_post_quota()
+        self.assertEqual(post_quota.pending, {})
+
+    async def test_released_during_failed_flush(self) -> None:
+        user = make_user(1)
+        consume_post_quota(user, "sell")
+
+        async def failed_write(post_dates: list) -> bool:
+            release_post_quota(user.id, "sell")
+            return False
+
+        with patch("app.database.update_users_post_dates", side_effect=failed_write):
+            with self.assertLogs(level="ERROR"):
+                await flush_post_quota()
+        self.assertEqual(post_quota.pending, {})
+
+
+class PostQuotaFlushTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        create_test_database()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        clear_test_database()
+
+    async def asyncSetUp(self) -> None:
+        reset_ledger()
+
+    async def asyncTearDown(self) -> None:
+        await close_async_pool()
+
+    async def test_flush_post_quota(self) -> None:
+        user = await get_user_from_id(mock_users[2].id)
+        self.assertTrue(consume_post_quota(user, "sell"))
+        db_user = await get_user_from_id(user.id)
+        self.assertEqual(db_user.last_sell_post, Dates.MARKET_EPOCH)
+
+        await flush_post_quota()
+        self.assertEqual(len(post_quota.pending), 0)
+        db_user = await get_user_from_id(user.id)
+        self.assertEqual(db_user.last_sell_post, user.last_sell_post)
+        self.assertEqual(db_user.last_buy_post, Dates.MARKET_EPOCH)
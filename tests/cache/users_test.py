@@ -1,12 +1,20 @@
+import asyncio
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import patch
 
-from app.cache import get_user, update_user_date, update_user_info
-from app.constants import Dates
-from tests.data import clear_test_database, create_test_database, mock_users
+from app import database as db
+from app.cache import (flush_user_info, get_user, has_role, insert_role,
+                       insert_user, load_role_index, remove_role,
+                       update_user_date, update_user_info)
+from app.cache.users import users_cache
+from app.constants import Dates, Roles
+from app.database import get_user_from_id
+from tests.data import (clear_test_database, close_async_pool,
+                        create_test_database, mock_users)
 
 
-class UsersTest(unittest.TestCase):
+class UsersTest(unittest.IsolatedAsyncioTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         create_test_database()
@@ -15,9 +23,12 @@ class UsersTest(unittest.TestCase):
     def tearDownClass(cls) -> None:
         clear_test_database()
 
-    def test_get_user(self) -> None:
+    async def asyncTearDown(self) -> None:
+        await close_async_pool()
+
+    async def test_get_user(self) -> None:
         user = mock_users[0]
-        test_user = get_user(id=mock_users[0].id)
+        test_user = await get_user(id=mock_users[0].id)
         self.assertEqual(test_user.id, user.id)
         self.assertEqual(test_user.username, user.username)
         self.assertEqual(test_user.first_name, user.first_name)
@@ -25,39 +36,152 @@ class UsersTest(unittest.TestCase):
         self.assertEqual(test_user.last_buy_post, Dates.MARKET_EPOCH)
         self.assertEqual(test_user.last_sell_post, Dates.MARKET_EPOCH)
 
-        user = get_user(id=10)
+        user = await get_user(id=10)
         self.assertEqual(user, None)
 
-        user = get_user(username="thisusernamedoesntexist")
+        user = await get_user(username="thisusernamedoesntexist")
         self.assertEqual(user, None)
 
-        user = get_user(username=mock_users[1].username)
+        user = await get_user(username=mock_users[1].username)
         self.assertEqual(user, mock_users[1])
 
-    def test_update_info(self) -> None:
-        user = get_user(id=mock_users[0].id)
+    async def test_update_info(self) -> None:
+        user = await get_user(id=mock_users[0].id)
         self.assertEqual(user, mock_users[0])
 
-        update_user_info(
+        await update_user_info(
             id=user.id,
             username="newusername",
             first_name=user.first_name,
             last_name=user.last_name,
         )
 
-        test_user = get_user(id=user.id)
+        test_user = await get_user(id=user.id)
         self.assertEqual(test_user.username, "newusername")
         self.assertEqual(test_user.first_name, user.first_name)
         self.assertEqual(test_user.last_name, user.last_name)
 
-    def test_update_date(self) -> None:
-        user = get_user(id=mock_users[0].id)
-        update_user_date(
+    async def test_flush_user_info(self) -> None:
+        user = await get_user(id=mock_users[3].id)
+        await update_user_info(
+            id=user.id,
+            username="flushedusername",
+            first_name=user.first_name,
+            last_name=user.last_name,
+        )
+        db_user = await get_user_from_id(id=user.id)
+        self.assertNotEqual(db_user.username, "flushedusername")
+
+        await flush_user_info()
+        db_user = await get_user_from_id(id=user.id)
+        self.assertEqual(db_user.username, "flushedusername")
+
+    async def test_update_date(self) -> None:
+        user = await get_user(id=mock_users[0].id)
+        await update_user_date(
             id=user.id,
             last_buy_post=datetime(year=2016, month=4, day=1),
             last_sell_post=datetime(year=2016, month=1, day=3),
         )
 
-        user = get_user(id=mock_users[0].id)
+        user = await get_user(id=mock_users[0].id)
         self.assertEqual(user.last_buy_post, datetime(year=2016, month=4, day=1))
         self.assertEqual(user.last_sell_post, datetime(year=2016, month=1, day=3))
+
+    async def test_roles(self) -> None:
+        await load_role_index()
+        self.assertEqual(has_role(mock_users[1].id, Roles.SELLER), False)
+
+        await insert_role(mock_users[1].id, Roles.SELLER)
+        self.assertEqual(has_role(mock_users[1].id, Roles.SELLER), True)
+        self.assertEqual(has_role(mock_users[1].id, Roles.ADMIN), False)
+
+        await load_role_index()
+        self.assertEqual(has_role(mock_users[1].id, Roles.SELLER), True)
+
+        await remove_role(mock_users[1].id, Roles.SELLER)
+        self.assertEqual(has_role(mock_users[1].id, Roles.SELLER), False)
+
+
+class MissingUsersTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        create_test_database()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        clear_test_database()
+
+    async def asyncTearDown(self) -> None:
+        users_cache.missing_ids.clear()
+        users_cache.missing_usernames.clear()
+        await close_async_pool()
+
+    async def test_missing_id(self) -> None:
+        self.assertEqual(await get_user(id=1000), None)
+        with patch(
+            "app.database.get_user_from_id", wraps=db.get_user_from_id
+        ) as lookup:
+            self.assertEqual(await get_user(id=1000), None)
+            lookup.assert_not_called()
+
+    async def test_missing_username(self) -> None:
+        self.assertEqual(await get_user(username="missingusername"), None)
+        with patch(
+            "app.database.get_user_from_username", wraps=db.get_user_from_username
+        ) as lookup:
+            self.assertEqual(await get_user(username="missingusername"), None)
+            lookup.assert_not_called()
+
+    async def test_insert_clears_missing(self) -> None:
+        self.assertEqual(await get_user(id=5), None)
+        self.assertEqual(await get_user(username="insertedusername"), None)
+
+        await insert_user(
+            id=5, username="insertedusername", first_name=None, last_name=None
+        )
+        self.assertEqual((await get_user(id=5)).id, 5)
+        self.assertEqual((await get_user(username="insertedusername")).id, 5)
+
+    async def test_update_clears_missing(self) -> None:
+        user = await get_user(id=mock_users[2].id)
+        self.assertEqual(await get_user(username="renamedusername"), None)
+
+        await update_user_info(
+            id=user.id,
+            username="renamedusername",
+            first_name=user.first_name,
+            last_name=user.last_name,
+        )
+        self.assertEqual((await get_user(username="renamedusername")).id, user.id)
+
+    async def test_missing_expiry(self) -> None:
+        id = mock_users[1].id
+        users_cache.users.pop(id)
+        users_cache.missing_ids.set(id, True, ttl=timedelta(milliseconds=50))
+        self.assertEqual(await get_user(id=id), None)
+
+        await asyncio.sleep(0.1)
+        self.assertEqual((await get_user(id=id)).id, id)
+
+
+class FlushUserInfoFailureTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self) -> None:
+        users_cache.pending_info = {}
+
+    async def test_failed_flush_is_kept(self) -> None:
+        users_cache.pending_info = {1: ("old1", None, None), 2: ("old2", None, None)}
+
+        async def failed_write(users_info: list) -> bool:
+            # A newer update arrives while the write is in flight
+            users_cache.pending_info[2] = ("new2", None, None)
+            return False
+
+        with patch("app.database.update_users_info", side_effect=failed_write):
+            with self.assertLogs(level="ERROR"):
+                await flush_user_info()
+
+        self.assertEqual(
+            users_cache.pending_info,
+            {1: ("old1", None, None), 2: ("new2", None, None)},
+        )
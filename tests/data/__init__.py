@@ -1,8 +1,10 @@
+import asyncio
+
 from dotenv import load_dotenv
 
 from app.constants import Dates
 from app.database import User, create_database, insert_user
-from app.database.base import get_connection
+from app.database.base import close_async_pool, get_connection
 
 mock_users = [
     User((1, None, None, b"test11", Dates.MARKET_EPOCH, Dates.MARKET_EPOCH)),
@@ -15,13 +17,18 @@ mock_users = [
 def create_test_database():
     load_dotenv(override=True)
     create_database()
+    asyncio.run(insert_mock_users())
+
+
+async def insert_mock_users():
     for mock_user in mock_users:
-        insert_user(
+        await insert_user(
             mock_user.id,
             mock_user.username,
             mock_user.first_name,
             mock_user.last_name,
         )
+    await close_async_pool()
 
 
 def clear_test_database():
@@ -38,3 +45,4 @@ def clear_test_database():
             cur.execute("DELETE FROM users WHERE id=2;")
             cur.execute("DELETE FROM users WHERE id=3;")
             cur.execute("DELETE FROM users WHERE id=4;")
+            cur.execute("DELETE FROM users WHERE id=5;")
@@ -0,0 +1,49 @@
+import unittest
+from datetime import datetime
+
+from app.database import delete_game_state, get_saved_games, save_game_state
+from tests.data import (clear_test_database, close_async_pool,
+                        create_test_database)
+
+
+class GameStateTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        create_test_database()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        clear_test_database()
+
+    async def asyncTearDown(self) -> None:
+        await delete_game_state(chat_id=-1)
+        await close_async_pool()
+
+    async def test_game_state(self) -> None:
+        start_time = datetime.now().replace(microsecond=0)
+        await save_game_state(
+            chat_id=-1,
+            game_type="emoji",
+            start_time=start_time,
+            data={"users_scores": {"1": 2}, "rounds_won": 1},
+        )
+        await save_game_state(
+            chat_id=-1,
+            game_type="emoji",
+            start_time=start_time,
+            data={"users_scores": {"1": 2, "2": 1}, "rounds_won": 2},
+        )
+        saved_games = [game for game in await get_saved_games() if game.chat_id == -1]
+        self.assertEqual(len(saved_games), 1)
+        self.assertEqual(saved_games[0].game_type, "emoji")
+        self.assertEqual(saved_games[0].start_time, start_time)
+        self.assertEqual(saved_games[0].data["rounds_won"], 2)
+        self.assertEqual(saved_games[0].data["users_scores"], {"1": 2, "2": 1})
+
+        await delete_game_state(chat_id=-1)
+        saved_games = [game for game in await get_saved_games() if game.chat_id == -1]
+        self.assertEqual(len(saved_games), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import asyncio
+import unittest
+
+from app.database import delete_game_state, get_saved_games
+from app.game_engine import (Game, GameState, active_games, load_saved_games,
+                             register_game, start_game, stop_game,
+                             suspend_games)
+from tests.data import (clear_test_database, close_async_pool,
+                        create_test_database, mock_users)
+
+CHAT_ID = -10
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> None:
+        self.sent.append(text)
+
+
+class FakeJobQueue:
+    def __init__(self) -> None:
+        self.jobs: list[str] = []
+
+    def run_repeating(self, callback, name: str, **kwargs) -> None:
+        self.jobs.append(name)
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.bot = FakeBot()
+        self.job_queue = FakeJobQueue()
+
+
+@register_game
+class FakeGame(Game):
+    game_type = "fake"
+    hint_count = 3
+    game_length = 2
+    first_round_delay = 0
+    round_delay = 0
+    hint_interval = 0.05
+
+    def __init__(self, chat_id: int) -> None:
+        super().__init__(chat_id)
+        self.events: list[str] = []
+        self.rounds = 0
+        self.max_rounds = 3
+        # Round number -> (hint, user) of the correct guess in that round
+        self.winners: dict[int, tuple[int, int]] = {}
+        self.closed = False
+
+    @property
+    def answer_name(self) -> str:
+        return "hexa"
+
+    async def start(self, context) -> None:
+        self.events.append("start")
+
+    async def next_round(self, context) -> bool:
+        if self.rounds >= self.max_rounds:
+            return False
+        self.rounds += 1
+        self.events.append(f"round {self.rounds}")
+        return True
+
+    async def send_hint(self, context) -> None:
+        self.events.append(f"hint {self.hint}")
+        winner = self.winners.get(self.rounds)
+        if winner is not None and winner[0] == self.hint:
+            asyncio.get_running_loop().call_soon(self.guess, winner[1], "hexa")
+
+    async def reveal(self, context) -> None:
+        self.events.append("reveal")
+
+    def is_correct(self, guess: str) -> bool:
+        return guess == "hexa"
+
+    def get_score(self) -> int:
+        return self.hint_count - self.hint
+
+    def close(self) -> None:
+        self.closed = True
+
+    def get_data(self) -> dict:
+        return {"rounds": self.rounds}
+
+    def set_data(self, data: dict) -> None:
+        self.rounds = data["rounds"]
+
+    def guess(self, user_id: int, guess: str) -> bool:
+        if self.state != GameState.GUESSING or not self.is_correct(guess):
+            return False
+        self.win_round(user_id)
+        return True
+
+
+class GameEngineTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        create_test_database()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        clear_test_database()
+
+    async def asyncSetUp(self) -> None:
+        self.context = FakeContext()
+
+    async def asyncTearDown(self) -> None:
+        active_games.clear()
+        await delete_game_state(CHAT_ID)
+        await close_async_pool()
+
+    async def run_game(self, game: Game) -> None:
+        self.assertTrue(start_game(game, self.context))
+        await game.task
+
+    async def is_saved(self) -> bool:
+        return any(game.chat_id == CHAT_ID for game in await get_saved_games())
+
+    def assert_ended(self, game: FakeGame) -> None:
+        self.assertEqual(game.state, GameState.FINISHED)
+        self.assertTrue(game.closed)
+        self.assertNotIn(CHAT_ID, active_games)
+        self.assertEqual(self.context.job_queue.jobs, [f"{CHAT_ID}cleaner"])
+
+    async def test_win(self) -> None:
+        game = FakeGame(CHAT_ID)
+        game.winners = {1: (0, mock_users[0].id), 2: (2, mock_users[1].id)}
+        await self.run_game(game)
+
+        self.assertEqual(
+            game.events,
+            ["start", "round 1", "hint 0", "round 2", "hint 0", "hint 1", "hint 2"],
+        )
+        self.assertEqual(game.users_scores, {mock_users[0].id: 3, mock_users[1].id: 1})
+        self.assertIn("Classifica finale", self.context.bot.sent[-1])
+        self.assert_ended(game)
+        self.assertFalse(await self.is_saved())
+
+    async def test_win_sets_round_won(self) -> None:
+        game = FakeGame(CHAT_ID)
+        game.state = GameState.GUESSING
+        self.assertTrue(game.guess(mock_users[0].id, "hexa"))
+        self.assertTrue(game.round_won.is_set())
+        self.assertEqual(game.state, GameState.ROUND_WON)
+        self.assertFalse(game.guess(mock_users[1].id, "hexa"))
+
+    async def test_timeout(self) -> None:
+        game = FakeGame(CHAT_ID)
+        game.max_rounds = 2
+        await self.run_game(game)
+
+        hints = ["hint 0", "hint 1", "hint 2", "reveal"]
+        self.assertEqual(game.events, ["start", "round 1", *hints, "round 2", *hints])
+        self.assertEqual(game.users_scores, {})
+        self.assert_ended(game)
+
+    async def test_stop_game(self) -> None:
+        game = FakeGame(CHAT_ID)
+        game.hint_interval = 10
+        self.assertTrue(start_game(game, self.context))
+        self.assertFalse(start_game(FakeGame(CHAT_ID), self.context))
+        await asyncio.sleep(0.1)
+
+        self.assertTrue(stop_game(CHAT_ID))
+        await asyncio.gather(game.task, return_exceptions=True)
+        self.assertEqual(game.events, ["start", "round 1", "hint 0"])
+        self.assert_ended(game)
+        self.assertFalse(await self.is_saved())
+        self.assertFalse(stop_game(CHAT_ID))
+
+    async def test_suspend_resume(self) -> None:
+        game = FakeGame(CHAT_ID)
+        game.hint_interval = 10
+        game.winners = {1: (0, mock_users[0].id)}
+        self.assertTrue(start_game(game, self.context))
+        while game.rounds < 2:
+            await asyncio.sleep(0.01)
+
+        await suspend_games()
+        self.assertNotIn(CHAT_ID, active_games)
+        self.assertEqual(self.context.job_queue.jobs, [])
+        self.assertTrue(await self.is_saved())
+
+        resumed_games = [
+            game for game in await load_saved_games() if game.chat_id == CHAT_ID
+        ]
+        self.assertEqual(len(resumed_games), 1)
+        resumed_game = resumed_games[0]
+        self.assertIsInstance(resumed_game, FakeGame)
+        self.assertEqual(resumed_game.rounds_won, 1)
+        self.assertEqual(resumed_game.rounds, 1)
+        self.assertEqual(resumed_game.users_scores, {mock_users[0].id: 3})
+        self.assertEqual(resumed_game.start_time, game.start_time)
+
+        resumed_game.winners = {2: (1, mock_users[1].id)}
+        self.assertTrue(start_game(resumed_game, self.context, resumed=True))
+        await resumed_game.task
+        self.assertEqual(resumed_game.events, ["round 2", "hint 0", "hint 1"])
+        self.assertIn("riprende", self.context.bot.sent[0])
+        self.assertEqual(
+            resumed_game.users_scores, {mock_users[0].id: 3, mock_users[1].id: 2}
+        )
+        self.assert_ended(resumed_game)
+        self.assertFalse(await self.is_saved())
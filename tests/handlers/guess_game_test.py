@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+
+from app.api import CardData
+from app.handlers.conversations.guess_game import GuessRound, GuessTheCardGame
+
+
+def make_round(name: str) -> GuessRound:
+    return GuessRound(
+        card_data=CardData(name=name, desc="", image_bytes=b""),
+        frames=(b"",) * 5,
+    )
+
+
+class PrefetchGame(GuessTheCardGame):
+    def __init__(self, rounds: list[GuessRound | Exception]) -> None:
+        super().__init__(-1)
+        self.rounds = rounds
+
+    async def prepare_round(self) -> GuessRound | None:
+        await asyncio.sleep(0.01)
+        if len(self.rounds) == 0:
+            return None
+        guess_round = self.rounds.pop(0)
+        if isinstance(guess_round, Exception):
+            raise guess_round
+        return guess_round
+
+
+class GuessGameTest(unittest.IsolatedAsyncioTestCase):
+    async def test_prefetched_rounds(self) -> None:
+        game = PrefetchGame([make_round("Hexa"), make_round("Trishula")])
+        game.start_prefetch()
+        self.assertTrue(await game.next_round(None))
+        self.assertEqual(game.answer_name, "Hexa")
+        self.assertTrue(await game.next_round(None))
+        self.assertEqual(game.answer_name, "Trishula")
+        self.assertFalse(await asyncio.wait_for(game.next_round(None), 1))
+
+    async def test_prefetch_failure(self) -> None:
+        game = PrefetchGame([make_round("Hexa"), RuntimeError("no cards")])
+        with self.assertLogs(level="ERROR"):
+            game.start_prefetch()
+            self.assertTrue(await game.next_round(None))
+            self.assertFalse(await asyncio.wait_for(game.next_round(None), 1))
+        self.assertTrue(game.prefetch_task.done())
+
+    async def test_close(self) -> None:
+        game = PrefetchGame([make_round("Hexa")])
+        game.start_prefetch()
+        task = game.prefetch_task
+        game.close()
+        await asyncio.gather(task, return_exceptions=True)
+        self.assertTrue(task.cancelled())
+        self.assertFalse(await game.next_round(None))
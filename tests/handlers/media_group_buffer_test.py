@@ -0,0 +1,44 @@
+import asyncio
+import unittest
+
+from app.handlers.chats.media_group_buffer import MediaGroupBuffer
+
+
+class MediaGroupBufferTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.flushed: list[list[int]] = []
+
+        async def flush(items: list[int]) -> None:
+            self.flushed.append(items)
+
+        self.buffer: MediaGroupBuffer[int] = MediaGroupBuffer(
+            flush=flush, quiet_period=0.1, max_delay=0.5, tick_length=0.02
+        )
+
+    async def test_groups(self) -> None:
+        self.buffer.append("a", 1)
+        self.buffer.append("b", 10)
+        self.buffer.append("a", 2)
+        await asyncio.sleep(0.2)
+        self.assertEqual(sorted(self.flushed), [[1, 2], [10]])
+        self.assertEqual(len(self.buffer.groups), 0)
+
+    async def test_debounce(self) -> None:
+        for i in range(5):
+            self.buffer.append("a", i)
+            await asyncio.sleep(0.06)
+        self.assertEqual(self.flushed, [])
+        await asyncio.sleep(0.15)
+        self.assertEqual(self.flushed, [[0, 1, 2, 3, 4]])
+
+    async def test_max_delay(self) -> None:
+        for i in range(12):
+            self.buffer.append("a", i)
+            await asyncio.sleep(0.06)
+        await asyncio.sleep(0.15)
+        self.assertEqual(len(self.flushed), 2)
+        self.assertEqual(self.flushed[0] + self.flushed[1], list(range(12)))
+
+
+if __name__ == "__main__":
+    unittest.main()
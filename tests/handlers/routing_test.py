@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime
+
+from telegram import Chat, InlineQuery, Message, Update, User
+from telegram.ext import MessageHandler, filters
+
+from app.config import approval_id, main_id, market_id
+from app.handlers import handler_groups, handler_routes
+from app.handlers.routing import (ALL_CHATS, RoutedHandlerGroup,
+                                  get_chat_category, route_handlers)
+
+
+def make_update(chat: Chat, text: str = "ciao") -> Update:
+    return Update(
+        1,
+        message=Message(
+            1, datetime.now(), chat, from_user=User(42, "user", False), text=text
+        ),
+    )
+
+
+async def callback(update: Update, context: object) -> None:
+    pass
+
+
+class RoutingTest(unittest.TestCase):
+    def test_chat_category(self) -> None:
+        supergroup = Chat.SUPERGROUP
+        self.assertEqual(
+            get_chat_category(make_update(Chat(market_id(), supergroup))), "market"
+        )
+        self.assertEqual(
+            get_chat_category(make_update(Chat(main_id(), supergroup))), "main"
+        )
+        self.assertEqual(
+            get_chat_category(make_update(Chat(approval_id(), supergroup))),
+            "approval",
+        )
+        self.assertEqual(
+            get_chat_category(make_update(Chat(42, Chat.PRIVATE))), "private"
+        )
+        self.assertEqual(get_chat_category(make_update(Chat(-1, supergroup))), "group")
+        inline_query = InlineQuery("1", User(42, "user", False), "hexa", "")
+        self.assertEqual(
+            get_chat_category(Update(1, inline_query=inline_query)), "none"
+        )
+        self.assertEqual(get_chat_category(object()), "none")
+
+    def test_routed_group(self) -> None:
+        first = MessageHandler(filters.Regex("^vendo"), callback)
+        second = MessageHandler(filters.TEXT, callback)
+        group = RoutedHandlerGroup([first, second], frozenset(("market",)))
+
+        market = Chat(market_id(), Chat.SUPERGROUP)
+        handler, _ = group.check_update(make_update(market, "vendo"))
+        self.assertIs(handler, first)
+        handler, _ = group.check_update(make_update(market, "cerco"))
+        self.assertIs(handler, second)
+        self.assertIsNone(
+            group.check_update(make_update(Chat(main_id(), Chat.SUPERGROUP)))
+        )
+
+    def test_route_handlers(self) -> None:
+        handler = MessageHandler(filters.TEXT, callback)
+        routed = route_handlers(
+            {0: [handler], 1: [handler]}, {1: frozenset(("private",))}
+        )
+        self.assertEqual(routed[0], [handler])
+        self.assertIsInstance(routed[1][0], RoutedHandlerGroup)
+
+    def test_handler_routes(self) -> None:
+        for group, chats in handler_routes.items():
+            self.assertIn(group, handler_groups)
+            self.assertTrue(chats <= ALL_CHATS)
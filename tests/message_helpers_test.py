@@ -1,10 +1,48 @@
+import json
+import os
 import unittest
+from datetime import datetime
+from difflib import SequenceMatcher
 
-from app.message_helpers import get_user_from_command_arg, get_user_from_text
-from tests.data import clear_test_database, create_test_database, mock_users
+from telegram import Chat, Message, PhotoSize
+from telegram.error import BadRequest
 
+from app.api import CardData
+from app.cache import peek_card_file_id, remove_card_file_id, set_card_file_id
+from app.constants import GuessGame
+from app.message_helpers import (get_lcs_length, get_market_post_type,
+                                 get_post_type, get_user_from_command_arg,
+                                 get_user_from_text, is_close_match,
+                                 send_card_photo)
+from tests.data import (clear_test_database, close_async_pool,
+                        create_test_database, mock_users)
 
-class UtilsTest(unittest.TestCase):
+
+class FakeBot:
+    def __init__(self, errors: list[BadRequest] | None = None) -> None:
+        self.errors = errors or []
+        self.photos: list[str | bytes] = []
+
+    async def send_photo(
+        self, chat_id: int, photo: str | bytes, caption: str | None = None
+    ) -> Message:
+        self.photos.append(photo)
+        if isinstance(photo, str) and len(self.errors) > 0:
+            raise self.errors.pop(0)
+        return Message(
+            1,
+            datetime.now(),
+            Chat(chat_id, Chat.GROUP),
+            photo=(PhotoSize("uploaded_file_id", "unique_id", 10, 10),),
+        )
+
+
+class FakeContext:
+    def __init__(self, bot: FakeBot) -> None:
+        self.bot = bot
+
+
+class UtilsTest(unittest.IsolatedAsyncioTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         create_test_database()
@@ -13,19 +51,24 @@ class UtilsTest(unittest.TestCase):
     def tearDownClass(cls) -> None:
         clear_test_database()
 
-    def test_get_user_from_command_arg(self) -> None:
-        self.assertEqual(get_user_from_command_arg("@fwfwwf"), None)
+    async def asyncTearDown(self) -> None:
+        await close_async_pool()
+
+    async def test_get_user_from_command_arg(self) -> None:
+        self.assertEqual(await get_user_from_command_arg("@fwfwwf"), None)
         self.assertEqual(
-            get_user_from_command_arg(f"{mock_users[1].id}"), mock_users[1]
+            await get_user_from_command_arg(f"{mock_users[1].id}"), mock_users[1]
         )
         self.assertEqual(
-            get_user_from_command_arg(f"{mock_users[1].username}"), mock_users[1]
+            await get_user_from_command_arg(f"{mock_users[1].username}"),
+            mock_users[1],
         )
         self.assertEqual(
-            get_user_from_command_arg("vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv"), None
+            await get_user_from_command_arg("vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv"),
+            None,
         )
 
-    def test_get_user_from_text(self) -> None:
+    async def test_get_user_from_text(self) -> None:
         test_cases = [
             (
                 f"#Feedback positivo per @{mock_users[1].username}, arrivato tutto perfettamente",
@@ -41,4 +84,115 @@ class UtilsTest(unittest.TestCase):
             ),
         ]
         for test_case in test_cases:
-            self.assertEqual(get_user_from_text(test_case[0]).username, test_case[1])
+            user = await get_user_from_text(test_case[0])
+            self.assertEqual(user.username, test_case[1])
+
+
+class MatchingTest(unittest.TestCase):
+    def test_get_lcs_length(self) -> None:
+        self.assertEqual(get_lcs_length("darkmagician", "darkmagician"), 12)
+        self.assertEqual(get_lcs_length("abcbdab", "bdcaba"), 4)
+        self.assertEqual(get_lcs_length("", "abc"), 0)
+
+    def test_is_close_match(self) -> None:
+        test_cases = [
+            ("darkmagician", "darkmagician"),
+            ("darkmagican", "darkmagician"),
+            ("darkmagicain", "darkmagician"),
+            ("blueeyeswhitedragon", "blueeyeswhitedragon"),
+            ("blueyeswhitedragon", "blueeyeswhitedragon"),
+            ("blueeyeswhitedrgn", "blueeyeswhitedragon"),
+            ("raigeki", "raigeki"),
+            ("raigek", "raigeki"),
+            ("potofgreed", "raigeki"),
+        ]
+        for guess, answer in test_cases:
+            ratio = SequenceMatcher(None, guess, answer).ratio()
+            self.assertEqual(
+                is_close_match(guess, answer, GuessGame.CORRECT_THRESHOLD),
+                ratio >= GuessGame.CORRECT_THRESHOLD,
+            )
+
+    def test_accepts_transpositions(self) -> None:
+        test_cases = [
+            ("inifnicteimpermanence", "infiniteimpermanence"),
+            ("itirckstarlilybell", "trickstarlilybell"),
+        ]
+        for guess, answer in test_cases:
+            ratio = SequenceMatcher(None, guess, answer).ratio()
+            self.assertLess(ratio, GuessGame.CORRECT_THRESHOLD)
+            self.assertTrue(is_close_match(guess, answer, GuessGame.CORRECT_THRESHOLD))
+
+
+class SendCardPhotoTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        create_test_database()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        clear_test_database()
+
+    async def asyncSetUp(self) -> None:
+        self.card_data = CardData(name="Test Card", desc="", image_bytes=b"image")
+
+    async def asyncTearDown(self) -> None:
+        await remove_card_file_id(self.card_data.name)
+        await close_async_pool()
+
+    async def send(self, bot: FakeBot) -> Message:
+        return await send_card_photo(-1, self.card_data, FakeContext(bot))
+
+    async def test_upload(self) -> None:
+        bot = FakeBot()
+        await self.send(bot)
+        self.assertEqual(bot.photos, [b"image"])
+        self.assertEqual(peek_card_file_id(self.card_data.name), "uploaded_file_id")
+
+    async def test_reuse(self) -> None:
+        await set_card_file_id(self.card_data.name, "cached_file_id")
+        bot = FakeBot()
+        await self.send(bot)
+        self.assertEqual(bot.photos, ["cached_file_id"])
+
+    async def test_invalid_file_id(self) -> None:
+        await set_card_file_id(self.card_data.name, "cached_file_id")
+        bot = FakeBot([BadRequest("Wrong file identifier/http url specified")])
+        await self.send(bot)
+        self.assertEqual(bot.photos, ["cached_file_id", b"image"])
+        self.assertEqual(peek_card_file_id(self.card_data.name), "uploaded_file_id")
+
+    async def test_other_errors(self) -> None:
+        await set_card_file_id(self.card_data.name, "cached_file_id")
+        for error in ("Chat not found", "Message caption is too long"):
+            bot = FakeBot([BadRequest(error)])
+            with self.assertRaises(BadRequest):
+                await self.send(bot)
+            self.assertEqual(bot.photos, ["cached_file_id"])
+            self.assertEqual(peek_card_file_id(self.card_data.name), "cached_file_id")
+
+
+class PostTypeTest(unittest.TestCase):
+    def test_labelled_posts(self) -> None:
+        with open(os.path.abspath("tests/data/market_posts.json"), "r") as f:
+            corpus: list[dict[str, str]] = list(json.load(f))
+        for post in corpus:
+            match post.get("kind", "text"):
+                case "caption":
+                    post_type = get_market_post_type(post["text"])
+                case "album":
+                    post_type = get_market_post_type(post["text"], album=True)
+                case _:
+                    post_type = get_post_type(post["text"])
+            self.assertEqual(post_type, post["label"], post["text"])
+
+    def test_captions(self) -> None:
+        caption = "Vendo Candina, feedback nel canale"
+        self.assertEqual(get_post_type(caption), "feedback")
+        self.assertEqual(get_market_post_type(caption), "sell")
+        self.assertEqual(get_market_post_type(caption, album=True), "sell")
+
+        caption = "Cerco staple, scambio"
+        self.assertEqual(get_market_post_type(caption), "sell")
+        self.assertEqual(get_market_post_type(caption, album=True), "buy")
+        self.assertEqual(get_market_post_type("feedback per @mario"), "none")
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from telegram import Chat, Message, Update, User
+
+from app.constants import UpdateProcessing
+from app.update_processor import (ChatOrderedUpdateProcessor,
+                                  get_max_concurrent_updates, get_update_keys)
+
+
+def make_update(update_id: int, chat_id: int, user_id: int) -> Update:
+    return Update(
+        update_id,
+        message=Message(
+            update_id,
+            datetime.now(),
+            Chat(chat_id, Chat.GROUP),
+            from_user=User(user_id, "test", False),
+        ),
+    )
+
+
+class UpdateProcessorTest(unittest.IsolatedAsyncioTestCase):
+    async def process(
+        self, processor: ChatOrderedUpdateProcessor, updates: list[Update]
+    ) -> list[int]:
+        processed: list[int] = []
+
+        async def handle(update: Update) -> None:
+            # Earlier updates take longer, so only the ordering can keep them first
+            await asyncio.sleep(0.01 * (len(updates) - update.update_id))
+            processed.append(update.update_id)
+
+        async with processor:
+            await asyncio.gather(
+                *(
+                    processor.process_update(update, handle(update))
+                    for update in updates
+                )
+            )
+        self.assertEqual(len(processor.tails), 0)
+        return processed
+
+    def test_update_keys(self) -> None:
+        self.assertEqual(
+            get_update_keys(make_update(1, -100, 7)), (("chat", -100), ("user", 7))
+        )
+        self.assertEqual(get_update_keys(object()), ())
+
+    def test_invalid_limits(self) -> None:
+        for max_concurrent_updates, max_pending_updates in ((0, 64), (-1, 64), (8, 4)):
+            with self.assertRaises(ValueError):
+                ChatOrderedUpdateProcessor(max_concurrent_updates, max_pending_updates)
+        processor = ChatOrderedUpdateProcessor(8, 8)
+        self.assertEqual(processor.max_concurrent_updates, 8)
+
+    def test_max_concurrent_updates_env(self) -> None:
+        with patch.dict(os.environ, {"MAX_CONCURRENT_UPDATES": "4"}):
+            self.assertEqual(get_max_concurrent_updates(), 4)
+        test_cases = [
+            ("0", 1),
+            ("-3", 1),
+            ("100000", UpdateProcessing.MAX_PENDING_UPDATES),
+            ("many", UpdateProcessing.MAX_CONCURRENT_UPDATES),
+        ]
+        for value, expected in test_cases:
+            with patch.dict(os.environ, {"MAX_CONCURRENT_UPDATES": value}):
+                with self.assertLogs(level="ERROR"):
+                    self.assertEqual(get_max_concurrent_updates(), expected)
+
+    async def test_same_chat_in_order(self) -> None:
+        processor = ChatOrderedUpdateProcessor(8, 64)
+        updates = [make_update(i, -100, i) for i in range(5)]
+        self.assertEqual(await self.process(processor, updates), [0, 1, 2, 3, 4])
+
+    async def test_same_user_in_order(self) -> None:
+        processor = ChatOrderedUpdateProcessor(8, 64)
+        updates = [make_update(i, -100 - i, 7) for i in range(5)]
+        self.assertEqual(await self.process(processor, updates), [0, 1, 2, 3, 4])
+
+    async def test_different_chats_concurrently(self) -> None:
+        processor = ChatOrderedUpdateProcessor(8, 64)
+        updates = [make_update(i, -100 - i, i) for i in range(5)]
+        self.assertEqual(await self.process(processor, updates), [4, 3, 2, 1, 0])
+
+    async def test_concurrency_limit(self) -> None:
+        processor = ChatOrderedUpdateProcessor(2, 64)
+        running = 0
+        max_running = 0
+
+        async def handle() -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        async with processor:
+            await asyncio.gather(
+                *(
+                    processor.process_update(make_update(i, -100 - i, i), handle())
+                    for i in range(6)
+                )
+            )
+        self.assertEqual(max_running, 2)